@@ -0,0 +1,158 @@
+# Avaliação em lote de locais candidatos, sem interface gráfica.
+#
+#   python batch.py sites.csv -o resultados.csv --workers 8
+#
+# Entrada CSV com as colunas id, source_lat, source_lng, pump_lat, pump_lng, reservoir_lat,
+# reservoir_lng e area (km²), ou GeoJSON com uma Feature por local: geometria MultiPoint
+# [fonte, bomba, reservatório] (lng, lat) e propriedades "id" e "area".
+#
+# Cada local passa pelo mesmo fluxo da Tela (elevações, distâncias, vazão Q7,10, modelo de
+# bomba e perdas nas duas tubulações). Os locais são distribuídos em um ProcessPoolExecutor
+# com um número limitado de tarefas em andamento, e cada resultado é gravado assim que fica
+# pronto, então a memória não cresce com o tamanho do levantamento.
+import argparse
+import csv
+import json
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from hammerpump.core import MATERIAL_ROUGHNESS, MAX_DISTANCE, MAX_HEIGHT, extract_value, select_pump
+from hammerpump.elevation import default_elevation_source
+from hammerpump.installation import calcular_geometria, calcular_perdas_instalacao, parametros_tubulacao
+
+INPUT_FIELDS = ['id', 'source_lat', 'source_lng', 'pump_lat', 'pump_lng', 'reservoir_lat', 'reservoir_lng', 'area']
+OUTPUT_FIELDS = [
+    'id', 'source_elevation', 'pump_elevation', 'reservoir_elevation',
+    'height_source_reservoir', 'distance_source_reservoir', 'height_source_pump', 'distance_source_pump',
+    'height_pump_reservoir', 'distance_pump_reservoir', 'flow', 'model', 'flow_min', 'flow_max',
+    'pipe_in', 'pipe_out', 'loss_in', 'loss_out', 'warnings', 'error',
+]
+
+_elevation_source = None
+
+
+def read_sites(path):
+    if path.lower().endswith(('.geojson', '.json')):
+        yield from read_geojson(path)
+        return
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            yield {field: row[field] for field in INPUT_FIELDS}
+
+
+def read_geojson(path):
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    for n, feature in enumerate(data.get('features', [])):
+        (source_lng, source_lat), (pump_lng, pump_lat), (reservoir_lng, reservoir_lat) = \
+            feature['geometry']['coordinates'][:3]
+        properties = feature.get('properties') or {}
+        yield {
+            'id': properties.get('id', n), 'area': properties['area'],
+            'source_lat': source_lat, 'source_lng': source_lng,
+            'pump_lat': pump_lat, 'pump_lng': pump_lng,
+            'reservoir_lat': reservoir_lat, 'reservoir_lng': reservoir_lng,
+        }
+
+
+# Executado uma vez em cada processo: cada um tem sua própria sessão HTTP e conexão com os caches.
+def init_worker():
+    global _elevation_source
+    _elevation_source = default_elevation_source()
+
+
+def evaluate_site(site, material_in, material_out):
+    result = {'id': site['id']}
+    try:
+        result.update(run_pipeline(site, material_in, material_out))
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    return result
+
+
+def run_pipeline(site, material_in, material_out):
+    source = (float(site['source_lat']), float(site['source_lng']))
+    pump = (float(site['pump_lat']), float(site['pump_lng']))
+    reservoir = (float(site['reservoir_lat']), float(site['reservoir_lng']))
+    # As três elevações em uma única consulta.
+    alt_source, alt_pump, alt_reservoir = _elevation_source.get_elevations([source, pump, reservoir])
+    geometria = calcular_geometria(source, reservoir, pump, alt_source, alt_reservoir, alt_pump)
+    result = {
+        'source_elevation': alt_source, 'pump_elevation': alt_pump, 'reservoir_elevation': alt_reservoir,
+        'height_source_reservoir': geometria.altura_fr, 'distance_source_reservoir': geometria.distancia_fr,
+        'height_source_pump': geometria.altura_fb, 'distance_source_pump': geometria.distancia_fb,
+        'height_pump_reservoir': geometria.altura_br, 'distance_pump_reservoir': geometria.distancia_br,
+    }
+    warnings = []
+    if alt_source > alt_reservoir:
+        warnings.append("gravidade")
+    if geometria.altura_br > MAX_HEIGHT:
+        warnings.append("altura>40m")
+    if geometria.distancia_br > MAX_DISTANCE:
+        warnings.append("distancia>400m")
+    # Mesmas unidades da Tela: Q7,10 → L/min.
+    flow = extract_value(*source, float(site['area'])) * 1000 / 60
+    result['flow'] = flow
+    model = select_pump(flow)
+    if model is None:
+        warnings.append("vazao insuficiente")
+        result['warnings'] = ';'.join(warnings)
+        return result
+    # Mesmo cálculo da Tela: alimentação com a vazão em L/min, recalque com a vazão elevada do
+    # modelo (L/h), cada tubulação entre as suas pontas.
+    loss_in, loss_out = calcular_perdas_instalacao(parametros_tubulacao(flow, model.pipe_in, material_in),
+                                                   parametros_tubulacao(model.flow_max, model.pipe_out, material_out,
+                                                                        'L/h'),
+                                                   geometria)
+    result.update({
+        'model': model.model, 'flow_min': model.flow_min, 'flow_max': model.flow_max,
+        'pipe_in': model.pipe_in, 'pipe_out': model.pipe_out, 'loss_in': loss_in, 'loss_out': loss_out,
+        'warnings': ';'.join(warnings),
+    })
+    return result
+
+
+# Gera os resultados na ordem em que terminam, com no máximo `window` locais em andamento.
+def evaluate_sites(sites, material_in, material_out, workers=None, window=None):
+    workers = workers or os.cpu_count() or 1
+    window = window or workers * 4
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as executor:
+        pending = set()
+        for site in sites:
+            pending.add(executor.submit(evaluate_site, site, material_in, material_out))
+            if len(pending) >= window:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        for future in pending:
+            yield future.result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Avaliação em lote de locais para bombas carneiro.")
+    parser.add_argument('input', help="CSV ou GeoJSON com os locais candidatos")
+    parser.add_argument('-o', '--output', default='-', help="CSV de saída (padrão: saída padrão)")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="número de processos")
+    parser.add_argument('--material-in', default="PVC (Policloreto de Vinila)", choices=sorted(MATERIAL_ROUGHNESS))
+    parser.add_argument('--material-out', default="PVC (Policloreto de Vinila)", choices=sorted(MATERIAL_ROUGHNESS))
+    args = parser.parse_args(argv)
+    output = sys.stdout if args.output == '-' else open(args.output, 'w', newline='', encoding='utf-8')
+    try:
+        writer = csv.DictWriter(output, fieldnames=OUTPUT_FIELDS)
+        writer.writeheader()
+        count = 0
+        for result in evaluate_sites(read_sites(args.input), args.material_in, args.material_out, args.workers):
+            writer.writerow(result)
+            output.flush()
+            count += 1
+            if result.get('error'):
+                print(f"{result['id']}: {result['error']}", file=sys.stderr)
+        print(f"{count} locais avaliados", file=sys.stderr)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
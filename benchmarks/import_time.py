@@ -0,0 +1,60 @@
+# Tempo de importação do núcleo de cálculo (hammerpump.core) em processos novos.
+#
+#   python benchmarks/import_time.py [--runs 10] [--budget-ms 100]
+#
+# Mede a mediana de `import hammerpump.core`, quanto disso é do próprio NumPy, e confere
+# que nenhum módulo pesado (PyQt5, folium, scipy, requests) foi carregado junto.
+# Termina com código 1 se o orçamento for excedido.
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ('PyQt5', 'folium', 'branca', 'scipy', 'requests')
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import numpy
+numpy_done = time.perf_counter()
+import hammerpump.core
+end = time.perf_counter()
+heavy = sorted({name.split('.')[0] for name in sys.modules} & set(%r))
+print(json.dumps({'total': (end - start) * 1000, 'numpy': (numpy_done - start) * 1000, 'heavy': heavy}))
+""" % (HEAVY,)
+
+
+def measure(runs):
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', PROBE], cwd=ROOT, check=True,
+                                capture_output=True, text=True).stdout
+        samples.append(json.loads(output))
+    return samples
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tempo de importação do hammerpump.core.")
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--budget-ms', type=float, default=100.0)
+    args = parser.parse_args(argv)
+    samples = measure(args.runs)
+    total = statistics.median(s['total'] for s in samples)
+    numpy_ms = statistics.median(s['numpy'] for s in samples)
+    heavy = sorted({name for s in samples for name in s['heavy']})
+    print(f"import hammerpump.core: {total:.1f} ms (mediana de {args.runs}), "
+          f"NumPy {numpy_ms:.1f} ms, núcleo {total - numpy_ms:.1f} ms")
+    if heavy:
+        print(f"Módulos pesados carregados: {', '.join(heavy)}")
+    if total > args.budget_ms or heavy:
+        print(f"FALHOU (orçamento: {args.budget_ms:.0f} ms, sem {', '.join(HEAVY)})")
+        return 1
+    print(f"OK (orçamento: {args.budget_ms:.0f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
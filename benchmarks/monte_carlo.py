@@ -0,0 +1,44 @@
+# Tempo da análise de incerteza (hammerpump.core.uncertainty.monte_carlo).
+#
+#   python benchmarks/monte_carlo.py [--samples 1000000] [--workers 4]
+#
+# Usa uma instalação de exemplo (Carneiro 4, 5 m de queda, 30 m de recalque) e compara a
+# execução em um processo com a execução dividida em `workers` processos; as duas devem dar
+# exatamente o mesmo resultado, porque as sementes são por bloco e não por processo.
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hammerpump.core import Site, default_catalog, monte_carlo  # noqa: E402
+
+SITE = Site((-23.4700, -47.4297), (-23.4710, -47.4290), (-23.4690, -47.4270), (600.0, 595.0, 625.0), 30.0,
+            default_catalog().select(30.0), (0.0318, 0.01), (0.0127, 0.01))
+
+
+def run(samples, workers):
+    start = time.perf_counter()
+    result = monte_carlo(SITE, samples=samples, workers=workers, seed=1)
+    return time.perf_counter() - start, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tempo da análise de incerteza.")
+    parser.add_argument('--samples', type=int, default=1_000_000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+    serial, expected = run(args.samples, 1)
+    print(f"1 processo: {serial:.2f} s")
+    if args.workers > 1:
+        parallel, result = run(args.samples, args.workers)
+        same = (result.delivered_flow == expected.delivered_flow).all()
+        print(f"{args.workers} processos: {parallel:.2f} s (resultados {'idênticos' if same else 'DIFERENTES'})")
+    print(f"vazão elevada P10/P50/P90: {expected.p10:.2f} / {expected.p50:.2f} / {expected.p90:.2f} L/min; "
+          f"não opera: {expected.prob_not_operating:.1%}; altura > 40 m: {expected.prob_height_exceeded:.1%}; "
+          f"distância > 400 m: {expected.prob_distance_exceeded:.1%}")
+
+
+if __name__ == "__main__":
+    main()
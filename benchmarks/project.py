@@ -0,0 +1,82 @@
+# Arquivos de projeto (hammerpump.project): tamanho e tempo para reabrir.
+#
+#   python benchmarks/project.py [--sites 300] [--vertices 20]
+#
+# Salva `sites` projetos de exemplo (três pontos, entradas, elevações e Q7,10, dois traçados
+# com `vertices` vértices) e informa o tamanho dos arquivos. Depois reabre cada um em um grafo
+# com os nós da interface (hammerpump.installation, sem Qt) e confere que nenhuma consulta à
+# rede é feita.
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hammerpump.installation import POINTS, define_nodes  # noqa: E402
+from hammerpump.project import Project, load_project, save_project  # noqa: E402
+from hammerpump.reactive import Graph  # noqa: E402
+
+
+def no_network(name, fn, args, on_result, on_error):
+    raise AssertionError(f"consulta à rede ao reabrir o projeto: {name}")
+
+
+# Consultas à rede da interface (elevação e Q7,10); nunca devem ser chamadas aqui.
+def lookup(*args):
+    raise AssertionError("consulta à rede ao reabrir o projeto")
+
+
+def build_graph():
+    return define_nodes(Graph(submit=no_network), lookup, lookup)
+
+
+def example(rng, vertices):
+    lat, lng = -23.47 + rng.uniform(-1, 1), -47.43 + rng.uniform(-1, 1)
+    points = {name: (lat + rng.uniform(-2e-3, 2e-3), lng + rng.uniform(-2e-3, 2e-3)) for name in POINTS}
+    inputs = dict(points, area=float(rng.uniform(1, 50)), vazao=30.0, tubo_entrada='1.1/4', tubo_saida='1/2',
+                  material_entrada='PVC (Policloreto de Vinila)', material_saida='PVC (Policloreto de Vinila)')
+    lookups = {f'elevacao_{name}': float(rng.uniform(550, 650)) for name in POINTS}
+    lookups['q710'] = float(rng.uniform(0.001, 0.01))
+    routes = {}
+    for name, (start, end) in (('entrada', ('fonte', 'bomba')), ('saida', ('bomba', 'reservatorio'))):
+        t = np.linspace(0, 1, vertices)
+        line = np.outer(1 - t, points[start]) + np.outer(t, points[end]) + rng.normal(0, 1e-5, (vertices, 2))
+        routes[name] = ([tuple(p) for p in line.tolist()], rng.uniform(550, 650, vertices).tolist())
+    return Project(inputs, lookups, routes, {'modelo': 'Marumby Carneiro 4'}, 'exemplo')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tamanho e abertura de arquivos de projeto.")
+    parser.add_argument('--sites', type=int, default=300)
+    parser.add_argument('--vertices', type=int, default=20)
+    args = parser.parse_args(argv)
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for n in range(args.sites):
+            path = os.path.join(directory, f'local_{n}.hpump')
+            save_project(path, example(rng, args.vertices))
+            paths.append(path)
+        sizes = [os.path.getsize(path) for path in paths]
+        print(f"{args.sites} projetos: {sum(sizes) / 1024:.0f} KB no total, "
+              f"média {statistics.mean(sizes):.0f} B, máximo {max(sizes)} B")
+        graph = build_graph()
+        timings = []
+        for path in paths:
+            start = time.perf_counter()
+            project = load_project(path)
+            graph.restore(project.inputs, project.lookups)
+            timings.append(time.perf_counter() - start)
+            assert graph.get('perdas') is not None
+    timings.sort()
+    print(f"reabrir (arquivo + grafo): mediana {timings[len(timings) // 2] * 1000:.2f} ms, "
+          f"máximo {timings[-1] * 1000:.2f} ms, sem consultas à rede")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# Geração de relatórios (hammerpump.report): um processo contra o lote em processos paralelos.
+#
+#   python benchmarks/reports.py [--sites 200] [--workers N]
+#
+# Salva `sites` projetos de exemplo (os de benchmarks/project.py) e um cache MBTiles com
+# tiles falsos de 30 KB cobrindo cada local nos zooms 14 a 18, e gera os relatórios HTML
+# primeiro em série, no próprio processo, depois com generate_reports(). Informa o tempo por
+# relatório e o tamanho médio dos arquivos.
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.project import example  # noqa: E402
+from hammerpump import report  # noqa: E402
+from hammerpump.project import save_project  # noqa: E402
+from hammerpump.tile_cache import TileCache, tiles_in_bounds  # noqa: E402
+
+FAKE_TILE = b'\xff\xd8\xff' + bytes(30000)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tempo de geração de relatórios em série e em lote.")
+    parser.add_argument('--sites', type=int, default=200)
+    parser.add_argument('--vertices', type=int, default=20)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args(argv)
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as directory:
+        tiles = TileCache(os.path.join(directory, 'tiles.mbtiles'))
+        paths = []
+        for n in range(args.sites):
+            project = example(rng, args.vertices)
+            lats, lngs = zip(*(project.inputs[name] for name in ('fonte', 'bomba', 'reservatorio')))
+            bounds = (min(lats) - 0.005, min(lngs) - 0.005, max(lats) + 0.005, max(lngs) + 0.005)
+            tiles.put_many([(z, x, y, FAKE_TILE) for z, x, y in tiles_in_bounds(bounds, range(14, 19))])
+            path = os.path.join(directory, f'local_{n}.hpump')
+            save_project(path, project)
+            paths.append(path)
+
+        serial = os.path.join(directory, 'serial')
+        os.makedirs(serial)
+        report.init_worker(tiles.path)
+        start = time.perf_counter()
+        for path, output in report.output_paths(paths, serial):
+            assert not report.report_file(path, output)['error']
+        elapsed = time.perf_counter() - start
+        sizes = [os.path.getsize(os.path.join(serial, name)) for name in os.listdir(serial)]
+        print(f"em série: {elapsed:.2f} s ({elapsed / len(paths) * 1000:.1f} ms por relatório), "
+              f"média {statistics.mean(sizes) / 1024:.0f} KB por relatório")
+
+        start = time.perf_counter()
+        rows = list(report.generate_reports(paths, os.path.join(directory, 'lote'), workers=args.workers,
+                                            tile_path=tiles.path))
+        elapsed = time.perf_counter() - start
+        assert not any(row['error'] for row in rows)
+        workers = args.workers or os.cpu_count()
+        print(f"em lote ({workers} processos): {elapsed:.2f} s ({elapsed / len(paths) * 1000:.1f} ms por relatório)")
+
+
+if __name__ == "__main__":
+    main()
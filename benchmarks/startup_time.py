@@ -0,0 +1,76 @@
+# Tempo de inicialização da interface gráfica: até a primeira pintura do formulário e até o
+# mapa terminar de carregar.
+#
+#   python benchmarks/startup_time.py                        # a partir do código-fonte
+#   python benchmarks/startup_time.py --bundle dist/interface/interface.exe
+#
+# A interface é aberta com HAMMERPUMP_STARTUP_PROBE=1, informa os marcos na saída padrão e
+# fecha sozinha quando o mapa fica pronto. O tempo é medido de fora, desde o lançamento do
+# processo (inclui a inicialização do interpretador ou do executável do PyInstaller), e
+# comparado ao orçamento de benchmarks/startup_budget.json. Termina com código 1 se exceder.
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_PATH = os.path.join(ROOT, 'benchmarks', 'startup_budget.json')
+STAGES = ('first_paint', 'map_ready')
+
+
+def run_once(command, timeout):
+    env = dict(os.environ, HAMMERPUMP_STARTUP_PROBE='1')
+    start = time.perf_counter()
+    process = subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.PIPE,
+                               stderr=subprocess.DEVNULL, text=True, bufsize=1)
+    marks = {}
+    try:
+        for line in process.stdout:
+            if line.startswith('startup:'):
+                stage = line[len('startup:'):].split('=')[0]
+                marks[stage] = (time.perf_counter() - start) * 1000
+                if all(s in marks for s in STAGES):
+                    break
+            if time.perf_counter() - start > timeout:
+                break
+    finally:
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    return marks
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tempo de inicialização da interface.")
+    parser.add_argument('--bundle', help="executável gerado pelo PyInstaller (interface.spec)")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--timeout', type=float, default=60.0)
+    args = parser.parse_args(argv)
+    if args.bundle:
+        command, mode = [os.path.abspath(args.bundle)], 'bundle'
+    else:
+        command, mode = [sys.executable, 'Interface.py'], 'source'
+    with open(BUDGET_PATH, encoding='utf-8') as f:
+        budget = json.load(f)[mode]
+    runs = [run_once(command, args.timeout) for _ in range(args.runs)]
+    failed = False
+    for stage in STAGES:
+        samples = [marks[stage] for marks in runs if stage in marks]
+        if not samples:
+            print(f"{stage}: não registrado")
+            failed = True
+            continue
+        median = statistics.median(samples)
+        ok = median <= budget[stage]
+        failed |= not ok
+        print(f"{stage}: {median:.0f} ms (mediana de {len(samples)}, orçamento {budget[stage]} ms) "
+              f"{'OK' if ok else 'EXCEDIDO'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
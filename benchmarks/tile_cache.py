@@ -0,0 +1,90 @@
+# Cache de tiles (hammerpump.tile_cache) contra um servidor de tiles local de teste.
+#
+#   python benchmarks/tile_cache.py [--zooms 12-15] [--latency-ms 20] [--budget-ms 5]
+#
+# Sobe um servidor HTTP em 127.0.0.1 que responde qualquer {z}/{y}/{x} com um JPEG falso
+# (após `latency-ms`), baixa uma região com prefetch() em um MBTiles temporário e mede a
+# leitura de todos os tiles do cache. Depois derruba o servidor e confere que fetch() continua
+# servindo a região sem rede. Termina com código 1 se o p99 da leitura exceder o orçamento.
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hammerpump.tile_cache import TileCache, TileError, tiles_in_bounds  # noqa: E402
+
+# Região em torno da coordenada inicial da interface (sul, oeste, norte, leste).
+BOUNDS = (-23.49, -47.45, -23.45, -47.41)
+
+
+def tile_server(latency):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency)
+            body = b'\xff\xd8\xff\xe0' + self.path.encode() * 400
+            self.send_response(200)
+            self.send_header('Content-Type', 'image/jpeg')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cache de tiles contra um servidor local.")
+    parser.add_argument('--zooms', default='12-15', help="intervalo de zooms, ex.: 12-15")
+    parser.add_argument('--latency-ms', type=float, default=20.0, help="latência do servidor de teste")
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--budget-ms', type=float, default=5.0, help="p99 máximo de uma leitura do cache")
+    args = parser.parse_args(argv)
+    first, last = (int(z) for z in args.zooms.split('-'))
+    zooms = range(first, last + 1)
+
+    server = tile_server(args.latency_ms / 1000)
+    url = f'http://127.0.0.1:{server.server_address[1]}/{{z}}/{{y}}/{{x}}'
+    with tempfile.TemporaryDirectory() as directory:
+        cache = TileCache(os.path.join(directory, 'tiles.mbtiles'), url=url)
+        tiles = list(tiles_in_bounds(BOUNDS, zooms))
+        start = time.perf_counter()
+        downloaded, failed = cache.prefetch(BOUNDS, zooms, workers=args.workers)
+        elapsed = time.perf_counter() - start
+        print(f"prefetch: {downloaded} tiles em {elapsed:.2f} s ({failed} falhas, {args.workers} downloads "
+              f"simultâneos; em série seriam ≥ {len(tiles) * args.latency_ms / 1000:.2f} s)")
+
+        timings = []
+        for tile in tiles:
+            start = time.perf_counter()
+            cache.get(*tile)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+        print(f"leitura do cache: mediana {statistics.median(timings):.3f} ms, p99 {p99:.3f} ms "
+              f"(orçamento {args.budget_ms} ms)")
+
+        server.shutdown()
+        server.server_close()
+        offline = sum(cache.fetch(*tile) is not None for tile in tiles)
+        try:
+            cache.fetch(first, 0, 0)
+            missing = "servido (inesperado)"
+        except TileError:
+            missing = "TileError"
+        print(f"sem rede: {offline}/{len(tiles)} tiles servidos do cache; tile fora da região: {missing}")
+        cache.close()
+    return 0 if p99 <= args.budget_ms and not failed and offline == len(tiles) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
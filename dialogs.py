@@ -0,0 +1,177 @@
+# Janelas auxiliares da interface principal (Tela).
+import numpy as np
+from PyQt5 import QtCore, QtSvg, QtWidgets
+
+from hammerpump.charts import line_chart
+from hammerpump.core.performance import MINUTES_PER_DAY, delivered_flow, performance_curves
+
+
+# Item numérico: ordena pelo valor, não pelo texto.
+def numeric_item(value, decimals):
+    item = QtWidgets.QTableWidgetItem()
+    item.setData(QtCore.Qt.DisplayRole, round(value, decimals))
+    item.setFlags(item.flags() & ~QtCore.Qt.ItemIsEditable)
+    return item
+
+
+def text_item(text):
+    item = QtWidgets.QTableWidgetItem(text)
+    item.setFlags(item.flags() & ~QtCore.Qt.ItemIsEditable)
+    return item
+
+
+# Tabela ordenável com o conjunto de Pareto das tubulações (pipe_optimizer.optimize_pipes).
+# Um duplo clique em uma linha emite `selected` com a opção escolhida.
+class PipeOptionsDialog(QtWidgets.QDialog):
+    selected = QtCore.pyqtSignal(object)
+
+    HEADERS = ["Tubulação", "Diâmetro (in)", "Material", "Perda (mca)", "Custo (R$/m)", "Custo total (R$)"]
+
+    def __init__(self, options, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Otimização das Tubulações")
+        self.resize(760, 420)
+        self.options = options
+        self.table = QtWidgets.QTableWidget(len(options), len(self.HEADERS), self)
+        self.table.setHorizontalHeaderLabels(self.HEADERS)
+        self.table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        for row, option in enumerate(options):
+            first = text_item("Entrada" if option.pipe == 'entrada' else "Saída")
+            # Guarda o índice da opção para recuperá-la depois de reordenar a tabela.
+            first.setData(QtCore.Qt.UserRole, row)
+            self.table.setItem(row, 0, first)
+            self.table.setItem(row, 1, text_item(option.diameter))
+            self.table.setItem(row, 2, text_item(option.material))
+            self.table.setItem(row, 3, numeric_item(option.loss, 4))
+            self.table.setItem(row, 4, numeric_item(option.cost_per_metre, 2))
+            self.table.setItem(row, 5, numeric_item(option.total_cost, 2))
+        self.table.setSortingEnabled(True)
+        self.table.resizeColumnsToContents()
+        self.table.cellDoubleClicked.connect(self.choose)
+        label = QtWidgets.QLabel("Clique no cabeçalho para ordenar; duplo clique aplica a opção.")
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.addWidget(label)
+        layout.addWidget(self.table)
+
+    def choose(self, row, column):
+        index = self.table.item(row, 0).data(QtCore.Qt.UserRole)
+        self.selected.emit(self.options[index])
+
+
+# Intervalo de zooms para baixar os tiles da região visível do mapa; mostra quantos tiles
+# serão baixados. Ao confirmar, emite `accepted_zooms` com range(zoom mínimo, zoom máximo + 1).
+class TilePrefetchDialog(QtWidgets.QDialog):
+    accepted_zooms = QtCore.pyqtSignal(object)
+
+    def __init__(self, bounds, zoom, count_tiles, parent=None, max_zoom=19):
+        super().__init__(parent)
+        self.setWindowTitle("Baixar Região")
+        self.bounds = bounds
+        self.count_tiles = count_tiles
+        self.zoom_min = QtWidgets.QSpinBox(self)
+        self.zoom_min.setRange(0, max_zoom)
+        self.zoom_min.setValue(zoom)
+        self.zoom_max = QtWidgets.QSpinBox(self)
+        self.zoom_max.setRange(0, max_zoom)
+        self.zoom_max.setValue(min(zoom + 3, max_zoom))
+        self.count = QtWidgets.QLabel(self)
+        buttons = QtWidgets.QDialogButtonBox(QtWidgets.QDialogButtonBox.Ok | QtWidgets.QDialogButtonBox.Cancel, self)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout = QtWidgets.QFormLayout(self)
+        layout.addRow("Zoom mínimo", self.zoom_min)
+        layout.addRow("Zoom máximo", self.zoom_max)
+        layout.addRow("Tiles", self.count)
+        layout.addRow(buttons)
+        self.zoom_min.valueChanged.connect(self.update_count)
+        self.zoom_max.valueChanged.connect(self.update_count)
+        self.update_count()
+
+    def zooms(self):
+        return range(self.zoom_min.value(), self.zoom_max.value() + 1)
+
+    def update_count(self):
+        self.count.setText(f"{self.count_tiles(self.bounds, self.zooms())}")
+
+    def accept(self):
+        super().accept()
+        self.accepted_zooms.emit(self.zooms())
+
+
+# Curvas de desempenho (vazão elevada × altura de recalque) dos modelos do catálogo para a
+# vazão de alimentação e a queda da instalação. Qualquer alteração nos campos ou na seleção de
+# modelos recalcula as curvas (uma chamada vetorizada) e redesenha o gráfico na hora.
+class PerformanceDialog(QtWidgets.QDialog):
+    MAX_DELIVERY_HEAD = 60.0
+    POINTS = 240
+
+    def __init__(self, models, feasible, drive_flow, supply_head, delivery_head, loss_in=0.0, loss_out=0.0,
+                 parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Desempenho das Bombas")
+        self.resize(900, 480)
+        self.models = list(models)
+        self.fields = {}
+        form = QtWidgets.QFormLayout()
+        for key, label, value, suffix in (
+                ('drive_flow', "Vazão de alimentação", drive_flow, " L/min"),
+                ('supply_head', "Queda de alimentação", supply_head, " m"),
+                ('delivery_head', "Altura de recalque", delivery_head, " m"),
+                ('loss_in', "Perda na alimentação", loss_in, " mca"),
+                ('loss_out', "Perda no recalque", loss_out, " mca")):
+            field = QtWidgets.QDoubleSpinBox(self)
+            field.setDecimals(2)
+            field.setRange(0.0, 100000.0)
+            field.setSuffix(suffix)
+            field.setValue(value)
+            field.valueChanged.connect(self.update_chart)
+            form.addRow(label, field)
+            self.fields[key] = field
+        self.model_list = QtWidgets.QListWidget(self)
+        for model in self.models:
+            item = QtWidgets.QListWidgetItem(f"{model.manufacturer} {model.model}")
+            item.setFlags(item.flags() | QtCore.Qt.ItemIsUserCheckable)
+            item.setCheckState(QtCore.Qt.Checked if model in feasible else QtCore.Qt.Unchecked)
+            self.model_list.addItem(item)
+        self.model_list.itemChanged.connect(self.update_chart)
+        self.summary = QtWidgets.QLabel(self)
+        self.summary.setWordWrap(True)
+        controls = QtWidgets.QVBoxLayout()
+        controls.addLayout(form)
+        controls.addWidget(QtWidgets.QLabel("Modelos"))
+        controls.addWidget(self.model_list)
+        controls.addWidget(self.summary)
+        self.chart = QtSvg.QSvgWidget(self)
+        self.chart.setMinimumSize(560, 360)
+        layout = QtWidgets.QHBoxLayout(self)
+        layout.addLayout(controls)
+        layout.addWidget(self.chart, 1)
+        self.update_chart()
+
+    def value(self, key):
+        return self.fields[key].value()
+
+    def checked_models(self):
+        return [model for row, model in enumerate(self.models)
+                if self.model_list.item(row).checkState() == QtCore.Qt.Checked]
+
+    def update_chart(self, *args):
+        models = self.checked_models()
+        if not models:
+            self.chart.load(QtCore.QByteArray())
+            self.summary.setText("Selecione ao menos um modelo.")
+            return
+        drive_flow, supply_head = self.value('drive_flow'), self.value('supply_head')
+        delivery_head, loss_in, loss_out = self.value('delivery_head'), self.value('loss_in'), self.value('loss_out')
+        heads = np.linspace(0.5, self.MAX_DELIVERY_HEAD, self.POINTS)
+        curves = performance_curves(models, drive_flow, supply_head, heads, loss_in, loss_out)
+        per_day = curves.delivered_flow[:, 0, :] * MINUTES_PER_DAY
+        series = [(model.model, np.where(q > 0, q, np.nan)) for model, q in zip(models, per_day)]
+        svg = line_chart(heads, series, "Altura de recalque (m)", "Vazão elevada (L/dia)",
+                         vlines=[(delivery_head, "instalação")] if 0 < delivery_head <= self.MAX_DELIVERY_HEAD else ())
+        self.chart.load(QtCore.QByteArray(svg.encode()))
+        q, eta = delivered_flow(models, drive_flow, supply_head, delivery_head, loss_in, loss_out)
+        self.summary.setText("\n".join(
+            f"{model.model}: {value:.2f} L/min ({value * MINUTES_PER_DAY:.0f} L/dia), η = {efficiency:.2f}"
+            if value > 0 else f"{model.model}: não opera nestas condições"
+            for model, value, efficiency in zip(models, q, eta)))
@@ -0,0 +1,4 @@
+# Hammer Pump: dimensionamento de instalações de bombas carneiro.
+#   hammerpump.core  – cálculos (geodésia, hidráulica, seleção de bombas, vazões); só NumPy e stdlib;
+#   hammerpump.*     – fontes de dados externas (elevação, caches, DEM).
+# A interface gráfica (Interface.py) e os scripts de linha de comando usam estes módulos.
@@ -0,0 +1,79 @@
+# Gráficos de linhas em SVG, sem dependências: usados na interface (QSvgWidget) e nos
+# relatórios. Recebem listas ou arrays NumPy e devolvem o SVG como texto.
+import math
+from xml.sax.saxutils import escape
+
+COLORS = ('#1f77b4', '#d62728', '#2ca02c', '#ff7f0e', '#9467bd', '#8c564b', '#e377c2', '#17becf')
+
+
+# Até ~`count` valores "redondos" (1, 2 ou 5 × 10^n) cobrindo [low, high].
+def nice_ticks(low, high, count=6):
+    if not high > low:
+        high = low + 1
+    step = (high - low) / max(count - 1, 1)
+    magnitude = 10 ** math.floor(math.log10(step))
+    step = next(m * magnitude for m in (1, 2, 5, 10) if m * magnitude >= step)
+    first = math.floor(low / step) * step
+    return [first + i * step for i in range(int(math.ceil((high - first) / step + 1e-9)) + 1)]
+
+
+def _label(value):
+    return f"{value:g}" if abs(value) >= 1e-9 else "0"
+
+
+# series: sequência de (rótulo, ys), todos sobre os mesmos `xs`; NaN interrompe a linha.
+# vlines: sequência de (x, rótulo) desenhadas como linhas verticais tracejadas.
+# Com y_zero=False o eixo y cobre só os valores (cotas, por exemplo), sem incluir o zero.
+def line_chart(xs, series, x_label='', y_label='', title='', vlines=(), width=640, height=360, y_zero=True):
+    xs = [float(x) for x in xs]
+    series = [(label, [float(y) for y in ys]) for label, ys in series]
+    finite = [y for _, ys in series for y in ys if math.isfinite(y)] or [0.0]
+    x_ticks = nice_ticks(min(xs), max(xs))
+    y_ticks = nice_ticks(min(0.0, min(finite)) if y_zero else min(finite), max(finite))
+    left, right, top, bottom = 60, 20, 30 if title else 12, 45
+    plot_w = width - left - right
+    plot_h = height - top - bottom
+
+    def px(x):
+        return left + (x - x_ticks[0]) / (x_ticks[-1] - x_ticks[0]) * plot_w
+
+    def py(y):
+        return top + plot_h - (y - y_ticks[0]) / (y_ticks[-1] - y_ticks[0]) * plot_h
+
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+             f'viewBox="0 0 {width} {height}" font-family="sans-serif" font-size="11">',
+             f'<rect width="{width}" height="{height}" fill="white"/>']
+    if title:
+        parts.append(f'<text x="{width / 2:.1f}" y="18" text-anchor="middle" font-size="13">{escape(title)}</text>')
+    for x in x_ticks:
+        parts.append(f'<line x1="{px(x):.1f}" y1="{top}" x2="{px(x):.1f}" y2="{top + plot_h}" stroke="#e5e5e5"/>')
+        parts.append(f'<text x="{px(x):.1f}" y="{top + plot_h + 15}" text-anchor="middle">{_label(x)}</text>')
+    for y in y_ticks:
+        parts.append(f'<line x1="{left}" y1="{py(y):.1f}" x2="{left + plot_w}" y2="{py(y):.1f}" stroke="#e5e5e5"/>')
+        parts.append(f'<text x="{left - 5}" y="{py(y) + 4:.1f}" text-anchor="end">{_label(y)}</text>')
+    parts.append(f'<rect x="{left}" y="{top}" width="{plot_w}" height="{plot_h}" fill="none" stroke="#888"/>')
+    parts.append(f'<text x="{left + plot_w / 2:.1f}" y="{height - 8}" text-anchor="middle">{escape(x_label)}</text>')
+    parts.append(f'<text transform="translate(14 {top + plot_h / 2:.1f}) rotate(-90)" '
+                 f'text-anchor="middle">{escape(y_label)}</text>')
+    for x, label in vlines:
+        parts.append(f'<line x1="{px(x):.1f}" y1="{top}" x2="{px(x):.1f}" y2="{top + plot_h}" '
+                     f'stroke="#555" stroke-dasharray="4 3"/>')
+        parts.append(f'<text x="{px(x) + 3:.1f}" y="{top + 12}">{escape(label)}</text>')
+    for n, (label, ys) in enumerate(series):
+        color = COLORS[n % len(COLORS)]
+        path = []
+        pen_down = False
+        for x, y in zip(xs, ys):
+            if not math.isfinite(y):
+                pen_down = False
+                continue
+            path.append(f"{'L' if pen_down else 'M'}{px(x):.1f},{py(y):.1f}")
+            pen_down = True
+        if path:
+            parts.append(f'<path d="{" ".join(path)}" fill="none" stroke="{color}" stroke-width="1.8"/>')
+        legend_y = top + 14 + 15 * n
+        parts.append(f'<line x1="{left + plot_w - 150}" y1="{legend_y - 4}" x2="{left + plot_w - 130}" '
+                     f'y2="{legend_y - 4}" stroke="{color}" stroke-width="2"/>')
+        parts.append(f'<text x="{left + plot_w - 125}" y="{legend_y}">{escape(label)}</text>')
+    parts.append('</svg>')
+    return '\n'.join(parts)
@@ -0,0 +1,35 @@
+# API estável do núcleo de cálculo. Importa apenas NumPy e a biblioteca padrão; dependências
+# pesadas (requests, scipy) só são carregadas dentro das funções que precisam delas.
+from .friction_table import FrictionTable, default_table, head_loss_function, perda_de_carga_tabela
+from .geodesy import (EARTH_RADIUS, haversine_array, haversine_with_height, haversine_with_height_array,
+                      iter_distance_blocks, nearest_neighbours, pairwise_distances)
+from .hydraulics import (FLOW_UNITS, LITRES_PER_HOUR, LITRES_PER_MINUTE, MATERIAL_ROUGHNESS, FrictionResult,
+                         friction_factor, head_loss, head_loss_detailed, perda_de_carga_Darcy_Weisbach,
+                         pipe_head_loss, reynolds, to_cubic_metres_per_second)
+from .performance import DEFAULT_EFFICIENCY, PerformanceCurves, delivered_flow, performance_curves, pipe_losses
+from .pipe_optimizer import PipeOption, optimize_pipes, parse_inches
+from .placement import Candidate, PlacementResult, find_pump_sites
+from .pumps import MAX_DISTANCE, MAX_HEIGHT, MIN_FLOW, PumpCatalog, PumpModel, default_catalog, select_pump
+from .regionalization import (ParseError, Regionalization, RegionalizationError, RowNotFoundError,
+                              ServiceUnavailableError, extract_value, get_regionalization)
+from .routes import Route, Segment
+from .terrain_profile import Profile, elevation_profile
+from .uncertainty import Site, Spread, UncertaintyResult, monte_carlo
+
+__all__ = [
+    'FrictionTable', 'default_table', 'head_loss_function', 'perda_de_carga_tabela',
+    'EARTH_RADIUS', 'haversine_array', 'haversine_with_height', 'haversine_with_height_array',
+    'iter_distance_blocks', 'nearest_neighbours', 'pairwise_distances',
+    'FLOW_UNITS', 'LITRES_PER_HOUR', 'LITRES_PER_MINUTE', 'MATERIAL_ROUGHNESS', 'FrictionResult',
+    'friction_factor', 'head_loss', 'head_loss_detailed', 'perda_de_carga_Darcy_Weisbach', 'pipe_head_loss',
+    'reynolds', 'to_cubic_metres_per_second',
+    'DEFAULT_EFFICIENCY', 'PerformanceCurves', 'delivered_flow', 'performance_curves', 'pipe_losses',
+    'PipeOption', 'optimize_pipes', 'parse_inches',
+    'Candidate', 'PlacementResult', 'find_pump_sites',
+    'MAX_DISTANCE', 'MAX_HEIGHT', 'MIN_FLOW', 'PumpCatalog', 'PumpModel', 'default_catalog', 'select_pump',
+    'ParseError', 'Regionalization', 'RegionalizationError', 'RowNotFoundError', 'ServiceUnavailableError',
+    'extract_value', 'get_regionalization',
+    'Route', 'Segment',
+    'Profile', 'elevation_profile',
+    'Site', 'Spread', 'UncertaintyResult', 'monte_carlo',
+]
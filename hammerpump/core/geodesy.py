@@ -0,0 +1,103 @@
+# Cálculos geodésicos: distâncias sobre a superfície da Terra considerando a altitude.
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from numpy.typing import ArrayLike
+
+# Radius of the Earth in meters
+EARTH_RADIUS = 6371000  # Approximately 6,371 km
+
+
+# Função responsável pelo cálculo das distâncias, levando em consideração vários fatores.
+def haversine_with_height(lath1: float, lonh1: float, alth1: float,
+                          lath2: float, lonh2: float, alth2: float) -> float:
+    # Convert latitude and longitude from degrees to radians
+    lath1 = math.radians(lath1)
+    lonh1 = math.radians(lonh1)
+    lath2 = math.radians(lath2)
+    lonh2 = math.radians(lonh2)
+    # Calculate differences in latitude, longitude, and altitude
+    dlath = lath2 - lath1
+    dlonh = lonh2 - lonh1
+    dalth = alth2 - alth1
+    # Haversine formula for distance calculation on the Earth's surface
+    a = math.sin(dlath / 2) ** 2 + math.cos(lath1) * math.cos(lath2) * math.sin(dlonh / 2) ** 2
+    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    distance = EARTH_RADIUS * c
+    # Add the height difference to the distance
+    distance_with_height = math.sqrt(distance ** 2 + dalth ** 2)
+    return distance_with_height
+
+
+# Versão vetorizada da fórmula de haversine (distância na superfície, sem altitude).
+def haversine_array(lat1: ArrayLike, lon1: ArrayLike, lat2: ArrayLike, lon2: ArrayLike) -> np.ndarray:
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=np.float64)) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return EARTH_RADIUS * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+# Versão vetorizada de haversine_with_height: os seis argumentos são combinados por broadcasting.
+def haversine_with_height_array(lat1: ArrayLike, lon1: ArrayLike, alt1: ArrayLike,
+                                lat2: ArrayLike, lon2: ArrayLike, alt2: ArrayLike,
+                                dtype=np.float64) -> np.ndarray:
+    distance = haversine_array(lat1, lon1, lat2, lon2).astype(dtype, copy=False)
+    return np.hypot(distance, np.asarray(alt2, dtype=dtype) - np.asarray(alt1, dtype=dtype))
+
+
+# Blocos da matriz de distâncias 3-D entre os pontos (lats1, lons1, alts1) e (lats2, lons2, alts2):
+# gera (início, fim, bloco) com as linhas [início, fim) da matriz, cada bloco com no máximo
+# `block_size` linhas, então a memória intermediária fica limitada a block_size × M.
+# Com dtype=np.float32 tudo é calculado em precisão simples: metade da memória e mais rápido,
+# com erro da ordem de 1 m na posição (e distâncias curtas relativamente menos precisas).
+def iter_distance_blocks(lats1: ArrayLike, lons1: ArrayLike, alts1: ArrayLike,
+                         lats2: ArrayLike, lons2: ArrayLike, alts2: ArrayLike,
+                         block_size: int = 1024, dtype=np.float64):
+    phi1, lam1 = (np.radians(np.asarray(v, dtype=np.float64)).astype(dtype) for v in (lats1, lons1))
+    phi2, lam2 = (np.radians(np.asarray(v, dtype=np.float64)).astype(dtype) for v in (lats2, lons2))
+    z1 = np.asarray(alts1, dtype=dtype)
+    z2 = np.asarray(alts2, dtype=dtype)
+    cos2 = np.cos(phi2)
+    radius = np.dtype(dtype).type(EARTH_RADIUS)
+    for start in range(0, len(phi1), block_size):
+        stop = min(start + block_size, len(phi1))
+        p1, l1 = phi1[start:stop, None], lam1[start:stop, None]
+        a = np.sin((phi2 - p1) / 2) ** 2 + np.cos(p1) * cos2 * np.sin((lam2 - l1) / 2) ** 2
+        # 2·asin(√a) equivale a 2·atan2(√a, √(1 − a)) para 0 ≤ a ≤ 1 e é mais barato.
+        ground = 2 * radius * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+        yield start, stop, np.hypot(ground, z2 - z1[start:stop, None])
+
+
+# Matriz N × M (ou N × N sem o segundo conjunto) de distâncias 3-D (m), calculada em blocos.
+# `out` permite gravar direto em um array já alocado (por exemplo, um np.memmap).
+def pairwise_distances(lats: ArrayLike, lons: ArrayLike, alts: ArrayLike, other=None,
+                       block_size: int = 1024, dtype=np.float64, out: np.ndarray | None = None) -> np.ndarray:
+    lats2, lons2, alts2 = (lats, lons, alts) if other is None else other
+    if out is None:
+        out = np.empty((len(np.atleast_1d(lats)), len(np.atleast_1d(lats2))), dtype=dtype)
+    for start, stop, block in iter_distance_blocks(lats, lons, alts, lats2, lons2, alts2, block_size, dtype):
+        out[start:stop] = block
+    return out
+
+
+# Para cada ponto do primeiro conjunto, os `k` mais próximos do segundo: (índices, distâncias),
+# ambos N × k, em ordem crescente de distância. Só um bloco da matriz existe de cada vez.
+def nearest_neighbours(lats1: ArrayLike, lons1: ArrayLike, alts1: ArrayLike,
+                       lats2: ArrayLike, lons2: ArrayLike, alts2: ArrayLike, k: int = 1,
+                       block_size: int = 1024, dtype=np.float64) -> tuple[np.ndarray, np.ndarray]:
+    n = len(np.atleast_1d(lats1))
+    k = min(k, len(np.atleast_1d(lats2)))
+    index = np.empty((n, k), dtype=np.intp)
+    distance = np.empty((n, k), dtype=dtype)
+    for start, stop, block in iter_distance_blocks(lats1, lons1, alts1, lats2, lons2, alts2, block_size, dtype):
+        part = np.argpartition(block, k - 1, axis=1)[:, :k] if k < block.shape[1] else \
+            np.broadcast_to(np.arange(block.shape[1]), block.shape)
+        values = np.take_along_axis(block, part, axis=1)
+        order = np.argsort(values, axis=1)
+        index[start:stop] = np.take_along_axis(part, order, axis=1)
+        distance[start:stop] = np.take_along_axis(values, order, axis=1)
+    return index, distance
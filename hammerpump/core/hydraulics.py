@@ -0,0 +1,126 @@
+# Perda de carga distribuída (Darcy-Weisbach) com fator de atrito de Colebrook-White.
+# Todas as funções aceitam escalares ou arrays NumPy (com broadcasting), então muitas
+# tubulações são resolvidas de uma vez, sem fsolve por tubulação:
+#   - regime laminar (Re < 2000): f = 64 / Re;
+#   - regime turbulento: estimativa inicial de Swamee-Jain seguida de um número fixo de
+#     iterações de Newton sobre a equação de Colebrook-White em x = 1 / sqrt(f).
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, NamedTuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from numpy.typing import ArrayLike
+
+g = 9.81  # Aceleração devido à gravidade (m/s²)
+WATER_VISCOSITY = 1.004e-6  # Viscosidade cinemática da água a 20 °C (m²/s)
+LAMINAR_LIMIT = 2000
+NEWTON_ITERATIONS = 3
+TOLERANCE = 1e-10
+
+# Unidades de vazão → m³/s. Na interface e nos cálculos da instalação a vazão de alimentação
+# (Q7,10, campo de vazão, drive_flow_*) é em L/min; a vazão elevada dos modelos do catálogo
+# (flow_min/flow_max) é em L/h. to_cubic_metres_per_second é o único ponto de conversão.
+LITRES_PER_MINUTE = 60000  # L/min em 1 m³/s
+LITRES_PER_HOUR = 3600000  # L/h em 1 m³/s
+FLOW_UNITS = {'m3/s': 1, 'L/s': 1000, 'L/min': LITRES_PER_MINUTE, 'L/h': LITRES_PER_HOUR}
+
+# Rugosidade absoluta dos materiais de tubulação (mm).
+MATERIAL_ROUGHNESS = {
+    "Aço Comum": 0.045,
+    "PVC (Policloreto de Vinila)": 0.01,
+    "Ferro Fundido": 0.26,
+    "Cobre": 0.01,
+    "Aço Galvanizado": 0.045,
+    "Polietileno (PE)": 0.001,
+    "Polipropileno (PP)": 0.01,
+    "CPVC (Cloreto de Polivinila Clorado)": 0.01,
+    "PP-R (Polipropileno Copolímero Random)": 0.01,
+    "ABS (Acrilonitrila Butadieno Estireno)": 0.01,
+    "Pex (Polietileno Reticulado)": 0.001
+}
+
+# f: fator de atrito; converged: resíduo relativo de Colebrook-White abaixo da tolerância.
+class FrictionResult(NamedTuple):
+    f: np.ndarray
+    reynolds: np.ndarray
+    laminar: np.ndarray
+    converged: np.ndarray
+
+
+def velocity(Q: ArrayLike, D: ArrayLike) -> np.ndarray:
+    return 4 * np.asarray(Q, dtype=np.float64) / (np.pi * np.asarray(D, dtype=np.float64) ** 2)
+
+
+def reynolds(Q: ArrayLike, D: ArrayLike, viscosity: float = WATER_VISCOSITY) -> np.ndarray:
+    return np.abs(velocity(Q, D)) * np.asarray(D, dtype=np.float64) / viscosity
+
+
+# Aproximação explícita de Swamee-Jain (usada como estimativa inicial).
+def swamee_jain(Re: ArrayLike, relative_roughness: ArrayLike) -> np.ndarray:
+    return 0.25 / np.log10(relative_roughness / 3.7 + 5.74 / Re ** 0.9) ** 2
+
+
+def friction_factor(Re: ArrayLike, relative_roughness: ArrayLike, iterations: int = NEWTON_ITERATIONS,
+                    tol: float = TOLERANCE) -> FrictionResult:
+    Re, rr = np.broadcast_arrays(np.asarray(Re, dtype=np.float64), np.asarray(relative_roughness, dtype=np.float64))
+    laminar = Re < LAMINAR_LIMIT
+    Re_t = np.maximum(Re, LAMINAR_LIMIT)
+    a = rr / 3.7
+    b = 2.51 / Re_t
+    x = 1 / np.sqrt(swamee_jain(Re_t, rr))
+    # Newton em F(x) = x + 2 log10(a + b x) = 0.
+    for _ in range(iterations):
+        u = a + b * x
+        x = x - (x + 2 * np.log10(u)) / (1 + 2 * b / (u * np.log(10)))
+    residual = np.abs(x + 2 * np.log10(a + b * x)) / x
+    with np.errstate(divide='ignore'):
+        f = np.where(laminar, 64 / np.where(Re > 0, Re, np.nan), 1 / x ** 2)
+    converged = laminar | (residual <= tol)
+    return FrictionResult(f, Re, laminar, converged)
+
+
+# Perda de carga (m) e resultado do fator de atrito.
+# Q: vazão (m³/s); D: diâmetro interno (m); L: comprimento (m); roughness: rugosidade absoluta (mm).
+def head_loss_detailed(Q: ArrayLike, D: ArrayLike, L: ArrayLike, roughness: ArrayLike,
+                       viscosity: float = WATER_VISCOSITY,
+                       iterations: int = NEWTON_ITERATIONS) -> tuple[np.ndarray, FrictionResult]:
+    D = np.asarray(D, dtype=np.float64)
+    Re = reynolds(Q, D, viscosity)
+    result = friction_factor(Re, np.asarray(roughness, dtype=np.float64) / 1000 / D, iterations)
+    v = velocity(Q, D)
+    # Sem vazão não há perda (o fator de atrito fica indefinido).
+    hf = np.where(Re > 0, np.nan_to_num(result.f) * np.asarray(L, dtype=np.float64) / D * v ** 2 / (2 * g), 0.0)
+    return hf, result
+
+
+def head_loss(Q: ArrayLike, D: ArrayLike, L: ArrayLike, roughness: ArrayLike,
+              viscosity: float = WATER_VISCOSITY) -> np.ndarray:
+    return head_loss_detailed(Q, D, L, roughness, viscosity)[0]
+
+
+def to_cubic_metres_per_second(flow: ArrayLike, unit: str = 'L/min') -> float | np.ndarray:
+    try:
+        factor = FLOW_UNITS[unit]
+    except KeyError:
+        raise ValueError(f"unidade de vazão desconhecida: {unit!r} (use {', '.join(FLOW_UNITS)})") from None
+    return flow / factor if np.isscalar(flow) else np.asarray(flow, dtype=np.float64) / factor
+
+
+# Perda de carga (m) com a vazão em `unit` (ver FLOW_UNITS); demais argumentos como em head_loss.
+# Com `friction_table`, o fator de atrito vem da tabela pré-calculada (friction_table).
+def pipe_head_loss(flow: ArrayLike, unit: str, D: ArrayLike, L: ArrayLike, roughness: ArrayLike,
+                   friction_table: bool = False) -> np.ndarray:
+    Q = to_cubic_metres_per_second(flow, unit)
+    if friction_table:
+        from .friction_table import head_loss as table_head_loss
+        return table_head_loss(Q, D, L, roughness)
+    return head_loss(Q, D, L, roughness)
+
+
+def perda_de_carga_Darcy_Weisbach(Q: ArrayLike, D: ArrayLike, L: ArrayLike,
+                                  rugosidade: ArrayLike) -> float | np.ndarray:
+    # Rugosidade em mm, como na tabela de materiais da interface.
+    Hf = head_loss(Q, D, L, rugosidade)
+    return float(Hf) if Hf.ndim == 0 else Hf
@@ -0,0 +1,109 @@
+# Vazão elevada por uma bomba carneiro (fórmula de D'Aubuisson):
+#
+#   q = η · Q · H / h
+#
+# Q: vazão de alimentação (L/min) usada pelo modelo; H: queda de alimentação (m, fonte → bomba)
+# descontada a perda na tubulação de alimentação; h: altura de recalque (m, bomba →
+# reservatório) somada à perda na tubulação de recalque; η: rendimento do modelo em função da
+# razão h/H, interpolado linearmente na curva do catálogo (ou em DEFAULT_EFFICIENCY).
+#
+# O modelo só usa a vazão dentro da sua faixa: acima de drive_flow_max o excedente passa
+# direto, abaixo de drive_flow_min a bomba não funciona (q = 0). Sem queda efetiva (H ≤ 0) ou
+# com h ≤ H (a gravidade basta) também q = 0.
+#
+# Tudo é vetorizado: vários modelos × qualquer grade de alturas e vazões em uma só chamada.
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, NamedTuple
+
+import numpy as np
+
+from .hydraulics import pipe_head_loss
+
+if TYPE_CHECKING:
+    from numpy.typing import ArrayLike
+
+    from .pumps import PumpModel
+
+# Curva genérica de rendimento (h/H, η) de bombas carneiro, usada quando o catálogo não traz a
+# do modelo. Valores indicativos de literatura; substitua pelas curvas dos fabricantes.
+DEFAULT_EFFICIENCY = (
+    (1.5, 0.75), (2.0, 0.72), (3.0, 0.68), (4.0, 0.64), (6.0, 0.58),
+    (8.0, 0.52), (10.0, 0.47), (15.0, 0.38), (20.0, 0.30), (30.0, 0.20),
+)
+
+MINUTES_PER_DAY = 1440
+
+
+class PerformanceCurves(NamedTuple):
+    models: tuple
+    supply_head: np.ndarray     # (S,)
+    delivery_head: np.ndarray   # (D,)
+    delivered_flow: np.ndarray  # (modelos, S, D), L/min
+    efficiency: np.ndarray      # (modelos, S, D)
+
+
+# Curvas de rendimento de todos os modelos nos mesmos nós de h/H (a união dos nós de cada
+# curva, então a interpolação linear de cada modelo é preservada): (nós, tabela modelos × nós).
+def efficiency_table(models: list[PumpModel]) -> tuple[np.ndarray, np.ndarray]:
+    curves = [np.array(model.efficiency or DEFAULT_EFFICIENCY, dtype=np.float64) for model in models]
+    nodes = np.unique(np.concatenate([curve[:, 0] for curve in curves]))
+    table = np.stack([np.interp(nodes, curve[:, 0], curve[:, 1]) for curve in curves])
+    return nodes, table
+
+
+# Interpola cada linha de `table` em x[linha] (x com forma (modelos, ...)); fora dos nós, o
+# valor da ponta mais próxima.
+def interpolate_rows(nodes: np.ndarray, table: np.ndarray, x: np.ndarray) -> np.ndarray:
+    x = np.clip(x, nodes[0], nodes[-1])
+    i = np.clip(np.searchsorted(nodes, x, side='right') - 1, 0, len(nodes) - 2)
+    weight = (x - nodes[i]) / (nodes[i + 1] - nodes[i])
+    rows = table.reshape(len(table), *([1] * (x.ndim - 1)), -1)
+    left = np.take_along_axis(rows, i[..., None], axis=-1)[..., 0]
+    right = np.take_along_axis(rows, (i + 1)[..., None], axis=-1)[..., 0]
+    return left + (right - left) * weight
+
+
+# Vazão elevada (L/min) e rendimento de cada modelo; os demais argumentos são combinados por
+# broadcasting e o resultado tem forma (modelos, *forma_combinada).
+# loss_in/loss_out: perdas de carga (m) nas tubulações de alimentação e de recalque, como as
+# calculadas por perda_de_carga_Darcy_Weisbach.
+def delivered_flow(models: list[PumpModel], drive_flow: ArrayLike, supply_head: ArrayLike,
+                   delivery_head: ArrayLike, loss_in: ArrayLike = 0.0,
+                   loss_out: ArrayLike = 0.0) -> tuple[np.ndarray, np.ndarray]:
+    Q, H, h, loss_in, loss_out = np.broadcast_arrays(*(np.asarray(value, dtype=np.float64) for value in
+                                                       (drive_flow, supply_head, delivery_head, loss_in, loss_out)))
+    shape = (len(models),) + (1,) * Q.ndim
+    low = np.array([model.drive_flow_min for model in models]).reshape(shape)
+    high = np.array([model.drive_flow_max for model in models]).reshape(shape)
+    used = np.where(Q[None] >= low, np.minimum(Q[None], high), 0.0)
+    H = np.broadcast_to(H - loss_in, used.shape)
+    h = np.broadcast_to(h + loss_out, used.shape)
+    valid = (H > 0) & (h > H) & (used > 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.where(valid, h / H, 1.0)
+        eta = interpolate_rows(*efficiency_table(models), ratio)
+        q = np.where(valid, eta * used * H / h, 0.0)
+    return q, np.where(valid, eta, 0.0)
+
+
+# Perdas de carga (m) nas tubulações de alimentação e de recalque de um modelo: a de
+# alimentação com a vazão que o modelo usa, a de recalque com a própria vazão elevada (uma
+# iteração de ponto fixo basta, porque essa perda é pequena perto da altura de recalque).
+# pipe_in/pipe_out: (diâmetro (m), comprimento (m), rugosidade (mm)); tudo por broadcasting.
+def pipe_losses(model: PumpModel, drive_flow: ArrayLike, supply_head: ArrayLike, delivery_head: ArrayLike,
+                pipe_in: tuple, pipe_out: tuple, friction_table: bool = False) -> tuple[np.ndarray, np.ndarray]:
+    drive_flow = np.asarray(drive_flow, dtype=np.float64)
+    used = np.where(drive_flow >= model.drive_flow_min, np.minimum(drive_flow, model.drive_flow_max), 0.0)
+    loss_in = pipe_head_loss(used, 'L/min', *pipe_in, friction_table=friction_table)
+    q = delivered_flow([model], drive_flow, supply_head, delivery_head, loss_in)[0][0]
+    return loss_in, pipe_head_loss(q, 'L/min', *pipe_out, friction_table=friction_table)
+
+
+# Curvas completas: cada modelo sobre a grade altura de alimentação × altura de recalque.
+def performance_curves(models: list[PumpModel], drive_flow: float, supply_head: ArrayLike,
+                       delivery_head: ArrayLike, loss_in: float = 0.0, loss_out: float = 0.0) -> PerformanceCurves:
+    supply_head = np.atleast_1d(np.asarray(supply_head, dtype=np.float64))
+    delivery_head = np.atleast_1d(np.asarray(delivery_head, dtype=np.float64))
+    q, eta = delivered_flow(models, drive_flow, supply_head[:, None], delivery_head[None, :], loss_in, loss_out)
+    return PerformanceCurves(tuple(models), supply_head, delivery_head, q, eta)
@@ -0,0 +1,95 @@
+# Escolha de diâmetro e material das tubulações de entrada (alimentação) e de saída (recalque).
+# Todas as combinações de diâmetro nominal comercial × material são avaliadas de uma vez
+# (arrays NumPy, sem fsolve por combinação) e o resultado é o conjunto de Pareto de
+# perda de carga × custo por metro de cada tubulação.
+from __future__ import annotations
+
+import json
+import os
+from typing import NamedTuple
+
+import numpy as np
+
+from .friction_table import head_loss_function
+from .hydraulics import MATERIAL_ROUGHNESS
+
+CATALOG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'pipe_catalog.json')
+INCH = 0.0254
+
+class PipeOption(NamedTuple):
+    pipe: str
+    diameter: str
+    material: str
+    loss: float
+    cost_per_metre: float
+    total_cost: float
+
+
+# Converte a notação de polegadas usada nos campos ("1/2", "1.1/4", "2") para float.
+def parse_inches(text: str) -> float:
+    text = str(text).strip().replace(',', '.').replace('"', '')
+    whole, _, fraction = text.rpartition('.') if '/' in text else ('', '', text)
+    if '/' in fraction:
+        numerator, denominator = fraction.split('/')
+        value = float(numerator) / float(denominator)
+    else:
+        value = float(fraction)
+    return value + (float(whole) if whole else 0.0)
+
+
+def load_catalog(path: str = CATALOG_PATH) -> dict:
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+# Arrays (diâmetros, materiais) do catálogo: rótulos, diâmetro (m), rugosidade (mm) e custo (R$/m).
+def catalog_grid(catalog):
+    labels = catalog['diameters']
+    inches = np.array([parse_inches(label) for label in labels])
+    materials = [name for name in catalog['materials'] if name in MATERIAL_ROUGHNESS]
+    roughness = np.array([MATERIAL_ROUGHNESS[name] for name in materials])
+    cost_1in = np.array([catalog['materials'][name]['cost_1in'] for name in materials])
+    exponent = np.array([catalog['materials'][name]['exponent'] for name in materials])
+    cost = cost_1in[None, :] * inches[:, None] ** exponent[None, :]
+    return labels, inches * INCH, materials, roughness, cost
+
+
+# Máscara dos pontos não dominados (menor perda e menor custo).
+def pareto_front(loss: np.ndarray, cost: np.ndarray) -> np.ndarray:
+    loss = np.asarray(loss, dtype=np.float64)
+    cost = np.asarray(cost, dtype=np.float64)
+    order = np.lexsort((loss, cost))
+    sorted_loss = loss[order]
+    best_before = np.concatenate([[np.inf], np.minimum.accumulate(sorted_loss)[:-1]])
+    mask = np.zeros(len(loss), dtype=bool)
+    mask[order] = sorted_loss < best_before
+    return mask
+
+
+# pipes: {"entrada": (Q, L), "saida": (Q, L)} com Q em m³/s e L em m.
+# Devolve a lista de PipeOption do conjunto de Pareto, por tubulação e em ordem crescente de perda.
+# Com `friction_table`, o fator de atrito vem da tabela pré-calculada (friction_table).
+def optimize_pipes(pipes: dict[str, tuple[float, float]], catalog: dict | None = None,
+                   max_velocity: float | None = None, friction_table: bool = False) -> list[PipeOption]:
+    catalog = catalog or load_catalog()
+    labels, diameters, materials, roughness, cost = catalog_grid(catalog)
+    names = list(pipes)
+    Q = np.array([pipes[name][0] for name in names], dtype=np.float64)[:, None, None]
+    L = np.array([pipes[name][1] for name in names], dtype=np.float64)[:, None, None]
+    # Uma única avaliação para (tubulação, diâmetro, material).
+    loss = head_loss_function(friction_table)(Q, diameters[None, :, None], L, roughness[None, None, :])
+    velocity = 4 * Q / (np.pi * diameters[None, :, None] ** 2)
+    options = []
+    for p, name in enumerate(names):
+        pipe_loss = loss[p].ravel()
+        pipe_cost = np.broadcast_to(cost, loss[p].shape).ravel()
+        allowed = np.ones(pipe_loss.shape, dtype=bool)
+        if max_velocity is not None:
+            allowed = np.broadcast_to(velocity[p], loss[p].shape).ravel() <= max_velocity
+        candidates = np.flatnonzero(allowed)
+        front = candidates[pareto_front(pipe_loss[candidates], pipe_cost[candidates])]
+        for k in front[np.argsort(pipe_loss[front])]:
+            d, m = np.unravel_index(k, loss[p].shape)
+            options.append(PipeOption(name, labels[d], materials[m], float(pipe_loss[k]),
+                                      float(pipe_cost[k]), float(pipe_cost[k] * L[p, 0, 0])))
+    return options
@@ -0,0 +1,113 @@
+# Busca automática da posição da bomba entre a fonte e o reservatório.
+#
+# Gera uma grade densa de posições candidatas (espaçamento `spacing`, dentro de `radius` da
+# fonte), consulta as elevações de todas de uma vez (DEM em memória) e avalia cada candidata
+# em lote, com as mesmas regras da Tela:
+#   - queda de alimentação (fonte → bomba) de pelo menos `min_fall`, ou seja, só posições
+#     abaixo da fonte;
+#   - altura e distância bomba → reservatório dentro dos limites do fabricante (40 m / 400 m);
+#   - opcionalmente, comprimento da tubulação de alimentação entre `drive_ratio` vezes a queda;
+#   - vazão elevada (performance.delivered_flow) com as perdas das duas tubulações.
+# As viáveis são ordenadas pela vazão elevada; as `top_k` melhores, afastadas entre si de
+# pelo menos `min_separation`, são devolvidas.
+from __future__ import annotations
+
+import math
+from typing import NamedTuple
+
+import numpy as np
+
+from .geodesy import EARTH_RADIUS, haversine_array
+from .performance import delivered_flow, pipe_losses
+from .pipe_optimizer import INCH, parse_inches
+from .pumps import MAX_DISTANCE, MAX_HEIGHT, PumpModel, default_catalog
+from .terrain_profile import lookup_elevations
+
+
+
+class Candidate(NamedTuple):
+    latitude: float
+    longitude: float
+    elevation: float
+    supply_head: float      # queda fonte → bomba (m)
+    delivery_head: float    # altura bomba → reservatório (m)
+    drive_length: float     # comprimento da tubulação de alimentação (m)
+    delivery_length: float  # comprimento da tubulação de recalque (m)
+    loss_in: float
+    loss_out: float
+    delivered_flow: float   # L/min
+
+
+class PlacementResult(NamedTuple):
+    candidates: list[Candidate]
+    model: PumpModel | None
+    evaluated: int
+    feasible: int
+
+
+# Pontos de uma grade regular (m) dentro do círculo de raio `radius` em torno de `center`.
+def candidate_grid(center: tuple[float, float], radius: float, spacing: float) -> tuple[np.ndarray, np.ndarray]:
+    steps = np.arange(-radius, radius + spacing / 2, spacing)
+    east, north = np.meshgrid(steps, steps)
+    inside = east ** 2 + north ** 2 <= radius ** 2
+    lat0 = math.radians(center[0])
+    lats = center[0] + np.degrees(north[inside] / EARTH_RADIUS)
+    lngs = center[1] + np.degrees(east[inside] / (EARTH_RADIUS * math.cos(lat0)))
+    return lats, lngs
+
+
+# source/reservoir: (lat, lng); drive_flow: vazão de alimentação (L/min); elevations: fonte
+# de elevações (DEM ou cliente da API, ver terrain_profile.lookup_elevations); roughness:
+# rugosidade (mm) das duas tubulações. Sem `model`, usa o indicado pelo catálogo para a vazão.
+def find_pump_sites(source: tuple[float, float], reservoir: tuple[float, float], drive_flow: float, elevations,
+                    model: PumpModel | None = None, roughness: float = 0.01, radius: float = 300.0,
+                    spacing: float = 5.0, min_fall: float = 1.0, drive_ratio: tuple[float, float] | None = None,
+                    top_k: int = 5, min_separation: float = 20.0,
+                    source_elevation: float | None = None,
+                    reservoir_elevation: float | None = None) -> PlacementResult:
+    if model is None:
+        model = default_catalog().select(drive_flow)
+    lats, lngs = candidate_grid(source, radius, spacing)
+    if model is None:
+        return PlacementResult([], None, len(lats), 0)
+    if source_elevation is None or reservoir_elevation is None:
+        source_elevation, reservoir_elevation = lookup_elevations(
+            elevations, np.array([source[0], reservoir[0]]), np.array([source[1], reservoir[1]]))
+    z = lookup_elevations(elevations, lats, lngs)
+
+    supply_head = source_elevation - z
+    delivery_head = reservoir_elevation - z
+    drive_length = np.hypot(haversine_array(*source, lats, lngs), supply_head)
+    delivery_length = np.hypot(haversine_array(lats, lngs, *reservoir), delivery_head)
+    feasible = (supply_head >= min_fall) & (delivery_head <= MAX_HEIGHT) & (delivery_length <= MAX_DISTANCE)
+    if drive_ratio is not None:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = drive_length / supply_head
+        feasible &= (ratio >= drive_ratio[0]) & (ratio <= drive_ratio[1])
+    index = np.flatnonzero(feasible)
+
+    d_in = parse_inches(model.pipe_in) * INCH
+    d_out = parse_inches(model.pipe_out) * INCH
+    H, h = supply_head[index], delivery_head[index]
+    loss_in, loss_out = pipe_losses(model, drive_flow, H, h, (d_in, drive_length[index], roughness),
+                                    (d_out, delivery_length[index], roughness))
+    q = delivered_flow([model], drive_flow, H, h, loss_in, loss_out)[0][0]
+    operating = q > 0
+    index, loss_in, loss_out, q = index[operating], loss_in[operating], loss_out[operating], q[operating]
+
+    # Melhores primeiro; as próximas demais de uma já escolhida são puladas.
+    chosen = []
+    for i in np.argsort(-q, kind='stable'):
+        if len(chosen) == top_k:
+            break
+        if chosen and min_separation > 0:
+            previous = index[chosen]
+            if haversine_array(lats[index[i]], lngs[index[i]], lats[previous], lngs[previous]).min() < min_separation:
+                continue
+        chosen.append(i)
+    candidates = [Candidate(float(lats[index[i]]), float(lngs[index[i]]), float(z[index[i]]),
+                            float(supply_head[index[i]]), float(delivery_head[index[i]]),
+                            float(drive_length[index[i]]), float(delivery_length[index[i]]),
+                            float(loss_in[i]), float(loss_out[i]), float(q[i]))
+                  for i in chosen]
+    return PlacementResult(candidates, model, len(lats), len(index))
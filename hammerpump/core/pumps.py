@@ -0,0 +1,111 @@
+# Seleção do modelo de bomba carneiro pela vazão disponível na fonte (L/min).
+#
+# Os modelos vêm de um catálogo versionado (data/pump_catalog.json), cada um com a faixa de
+# vazão de alimentação [drive_flow_min, drive_flow_max) em que é indicado. O catálogo é
+# indexado por intervalos elementares: os limites de todas as faixas, ordenados, dividem o
+# eixo de vazões em segmentos, e cada segmento guarda de antemão os modelos viáveis nele.
+# Uma consulta é um bisect nos limites (searchsorted para arrays de vazões), independente
+# do número de modelos, e devolve todos os modelos viáveis, não só o primeiro.
+from __future__ import annotations
+
+import bisect
+import functools
+import json
+import math
+import os
+from typing import TYPE_CHECKING, NamedTuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from numpy.typing import ArrayLike
+
+CATALOG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'pump_catalog.json')
+
+
+# flow_min/flow_max: vazão elevada pela bomba; pipe_in/pipe_out: diâmetros (in) das tubulações;
+# drive_flow_min/drive_flow_max: faixa de vazão de alimentação (L/min) do modelo;
+# efficiency: curva de rendimento ((h/H, η), ...) do modelo, vazia = curva genérica (performance).
+class PumpModel(NamedTuple):
+    model: str
+    flow_min: float
+    flow_max: float
+    pipe_in: str
+    pipe_out: str
+    manufacturer: str = 'Marumby'
+    drive_flow_min: float = 0.0
+    drive_flow_max: float = math.inf
+    efficiency: tuple = ()
+
+
+# Abaixo desta vazão (L/min) a bomba carneiro não é indicada.
+MIN_FLOW = 15
+
+# Limites do fabricante entre a bomba e o reservatório (m).
+MAX_HEIGHT = 40
+MAX_DISTANCE = 400
+
+
+class PumpCatalog:
+    def __init__(self, models: list[PumpModel], version: int | None = None):
+        self.models = tuple(models)
+        self.version = version
+        # Limites de todas as faixas; o segmento i vai de bounds[i] a bounds[i + 1].
+        self.bounds = sorted({m.drive_flow_min for m in self.models} | {m.drive_flow_max for m in self.models})
+        self._bounds = np.array(self.bounds)
+        low = np.array([m.drive_flow_min for m in self.models])
+        high = np.array([m.drive_flow_max for m in self.models])
+        mask = (low[None, :] <= self._bounds[:, None]) & (self._bounds[:, None] < high[None, :])
+        self.segments = [tuple(self.models[j] for j in np.flatnonzero(row)) for row in mask]
+        # Uma linha a mais, toda falsa, para vazões abaixo do primeiro limite.
+        self._mask = np.vstack([mask, np.zeros((1, len(self.models)), dtype=bool)])
+        # Modelo preferido (primeiro do catálogo) de cada segmento, -1 se nenhum.
+        self._primary = np.where(self._mask.any(axis=1), self._mask.argmax(axis=1), -1)
+
+    @classmethod
+    def load(cls, path: str = CATALOG_PATH) -> PumpCatalog:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        models = []
+        for entry in data['models']:
+            drive_flow_max = entry.get('drive_flow_max')
+            models.append(PumpModel(
+                entry['model'], float(entry['flow_min']), float(entry['flow_max']),
+                str(entry['pipe_in']), str(entry['pipe_out']), entry.get('manufacturer', ''),
+                float(entry['drive_flow_min']), math.inf if drive_flow_max is None else float(drive_flow_max),
+                tuple((float(ratio), float(eta)) for ratio, eta in entry.get('efficiency', ()))))
+        return cls(models, data.get('version'))
+
+    # Todos os modelos indicados para a vazão de alimentação, na ordem do catálogo.
+    def feasible(self, vazao: float) -> tuple[PumpModel, ...]:
+        i = bisect.bisect_right(self.bounds, vazao) - 1
+        return self.segments[i] if i >= 0 else ()
+
+    def select(self, vazao: float) -> PumpModel | None:
+        models = self.feasible(vazao)
+        return models[0] if models else None
+
+    def _segment(self, vazoes: ArrayLike) -> np.ndarray:
+        # Vazões abaixo do primeiro limite caem na linha extra de _mask; NaN cai no segmento
+        # a partir do maior limite, que nunca tem modelos.
+        i = np.searchsorted(self._bounds, np.asarray(vazoes, dtype=np.float64), side='right') - 1
+        return np.where(i >= 0, i, len(self.bounds))
+
+    # Índice em `models` do modelo preferido para cada vazão (-1 se nenhum).
+    def select_many(self, vazoes: ArrayLike) -> np.ndarray:
+        return self._primary[self._segment(vazoes)]
+
+    # Matriz (vazões × modelos) com os modelos viáveis para cada vazão.
+    def feasible_many(self, vazoes: ArrayLike) -> np.ndarray:
+        return self._mask[self._segment(vazoes)]
+
+
+@functools.lru_cache(maxsize=None)
+def default_catalog() -> PumpCatalog:
+    return PumpCatalog.load()
+
+
+def select_pump(vazao: float) -> PumpModel | None:
+    if vazao < MIN_FLOW:
+        return None
+    return default_catalog().select(vazao)
@@ -0,0 +1,261 @@
+# Consulta ao Mapa de Regionalização de Vazões (LEB/ESALQ).
+# A página resultado.php é lida em streaming, linha a linha, e a leitura para assim que as
+# linhas desejadas da tabela (Qmlt, Q90, Q95, Q7,10) são encontradas. Os resultados ficam em
+# um cache SQLite indexado por (lat, long, área), então consultas repetidas não voltam ao servidor.
+#
+# Com uma base pré-calculada (OfflineRegionalization), as vazões são estimadas localmente:
+# o ponto é associado à região do vértice mais próximo da grade (KD-tree) e a vazão vem da
+# equação regional Q = a * área ** b.
+from __future__ import annotations
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import NamedTuple
+
+import numpy as np
+
+from ..settings import CACHE_DIR, REGIONALIZATION_DATASET, REGIONALIZATION_URL, REQUEST_TIMEOUT
+
+# Vazões da tabela de resultados; campos ausentes na página ficam como None.
+class Regionalization(NamedTuple):
+    qmlt: float | None
+    q90: float | None
+    q95: float | None
+    q710: float | None
+
+# Identificação de cada linha pelo texto da primeira célula (sem espaços, em maiúsculas).
+ROW_LABELS = {
+    'qmlt': ('QMLT',),
+    'q90': ('Q90',),
+    'q95': ('Q95',),
+    'q710': ('Q7,10', '7,10'),
+}
+ALL_ROWS = tuple(ROW_LABELS)
+
+CELL = re.compile(r'<td[^>]*>(.*?)</td>', re.IGNORECASE | re.DOTALL)
+TAG = re.compile(r'<[^>]+>')
+
+
+class RegionalizationError(Exception):
+    pass
+
+
+class ServiceUnavailableError(RegionalizationError):
+    pass
+
+
+class RowNotFoundError(RegionalizationError):
+    pass
+
+
+class ParseError(RegionalizationError):
+    pass
+
+
+def parse_number(text):
+    text = text.replace('&nbsp;', '').strip()
+    if ',' in text:
+        text = text.replace('.', '').replace(',', '.')
+    try:
+        return float(text)
+    except ValueError:
+        raise ParseError(f"Valor não numérico na tabela: {text!r}") from None
+
+
+# Devolve (nome da linha, valor) se a linha HTML for uma das linhas da tabela de vazões.
+def parse_row(line):
+    cells = [TAG.sub('', cell).strip() for cell in CELL.findall(line)]
+    if len(cells) < 2:
+        return None
+    label = cells[0].replace(' ', '').upper()
+    for name, labels in ROW_LABELS.items():
+        if any(label == candidate or label.startswith(candidate) for candidate in labels):
+            return name, parse_number(cells[-1])
+    # Formato antigo: o rótulo não está na primeira célula, mas a linha contém "7,10".
+    if '7,10' in line:
+        return 'q710', parse_number(cells[-1])
+    return None
+
+
+# Lê as linhas da página até encontrar todas as `rows` pedidas.
+def parse_lines(lines, rows=ALL_ROWS):
+    found = {}
+    wanted = set(rows)
+    for line in lines:
+        row = parse_row(line) if '<td' in line.lower() else None
+        if row is not None and row[0] in wanted and row[0] not in found:
+            found[row[0]] = row[1]
+            if wanted <= found.keys():
+                break
+    return found
+
+
+def fetch_regionalization(lat: float, long: float, area: float, rows: tuple[str, ...] = ALL_ROWS,
+                          session=None, timeout: float = REQUEST_TIMEOUT) -> Regionalization:
+    # requests só é importado quando o site é de fato consultado (o núcleo não depende dele).
+    import requests
+
+    params = {'lat': lat, 'long': long, 'area': area}
+    http = session or requests
+    try:
+        with http.get(REGIONALIZATION_URL, params=params, timeout=timeout, stream=True) as response:
+            if response.status_code != 200:
+                raise ServiceUnavailableError(f"Failed to retrieve the web page (HTTP {response.status_code})")
+            if response.encoding is None:
+                response.encoding = 'latin-1'
+            found = parse_lines(response.iter_lines(decode_unicode=True), rows)
+    except requests.RequestException as e:
+        raise ServiceUnavailableError(f"Failed to retrieve the web page: {e}") from e
+    if 'q710' in rows and 'q710' not in found:
+        raise RowNotFoundError("Row with 'Q7,10' not found in the HTML content")
+    return Regionalization(**{name: found.get(name) for name in ALL_ROWS})
+
+
+class RegionalizationCache:
+    def __init__(self, path=None, precision=6):
+        if path is None:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            path = os.path.join(CACHE_DIR, 'regionalization.sqlite')
+        self.path = path
+        self.precision = precision
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS regionalization ('
+            'lat REAL NOT NULL, long REAL NOT NULL, area REAL NOT NULL, '
+            'result TEXT NOT NULL, fetched_at REAL NOT NULL, '
+            'PRIMARY KEY (lat, long, area)) WITHOUT ROWID')
+
+    def key(self, lat, long, area):
+        return round(float(lat), self.precision), round(float(long), self.precision), round(float(area), 6)
+
+    def get(self, lat, long, area):
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT result FROM regionalization WHERE lat = ? AND long = ? AND area = ?',
+                self.key(lat, long, area)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return Regionalization(**json.loads(row[0]))
+
+    def put(self, lat, long, area, result):
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO regionalization (lat, long, area, result, fetched_at) VALUES (?, ?, ?, ?, ?)',
+                (*self.key(lat, long, area), json.dumps(result._asdict()), time.time()))
+            self._conn.commit()
+
+
+# Formato da base (JSON):
+# {
+#   "version": 1,
+#   "points": [[lat, lng, "região"], ...],
+#   "regions": {"região": {"qmlt": [a, b], "q90": [a, b], "q95": [a, b], "q710": [a, b]}, ...}
+# }
+# As vazões seguem a unidade usada na regressão (a mesma da página resultado.php).
+class OfflineRegionalization:
+    def __init__(self, points, regions, max_distance=None):
+        from scipy.spatial import cKDTree
+
+        lats = np.array([p[0] for p in points], dtype=np.float64)
+        lngs = np.array([p[1] for p in points], dtype=np.float64)
+        names = sorted(regions)
+        index = {name: i for i, name in enumerate(names)}
+        self.regions = names
+        self.point_region = np.array([index[p[2]] for p in points], dtype=np.intp)
+        # Coeficientes (a, b) por região e por vazão: shape (regiões, 2).
+        self.coefficients = {
+            row: np.array([regions[name].get(row, (np.nan, np.nan)) for name in names], dtype=np.float64)
+            for row in ALL_ROWS
+        }
+        # Distância máxima (m) até o vértice mais próximo; mais longe que isso o ponto fica sem estimativa.
+        self.max_distance = max_distance
+        self.tree = cKDTree(unit_vectors(lats, lngs))
+
+    @classmethod
+    def load(cls, path, max_distance=None):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != 1:
+            raise RegionalizationError(f"Versão de base de regionalização não suportada: {data.get('version')}")
+        return cls(data['points'], data['regions'], max_distance)
+
+    # Consulta vetorizada: devolve um Regionalization de arrays (NaN fora da área coberta).
+    def query(self, lats, lngs, areas):
+        lats, lngs, areas = np.broadcast_arrays(*(np.asarray(v, dtype=np.float64) for v in (lats, lngs, areas)))
+        chord, nearest = self.tree.query(unit_vectors(lats.ravel(), lngs.ravel()))
+        region = self.point_region[nearest]
+        valid = np.ones(region.shape, dtype=bool)
+        if self.max_distance is not None:
+            # Distância em corda sobre a esfera unitária → distância aproximada em metros.
+            valid = chord * 6371000 <= self.max_distance
+        flat_areas = areas.ravel()
+        values = {}
+        for row, coefficients in self.coefficients.items():
+            a, b = coefficients[region, 0], coefficients[region, 1]
+            with np.errstate(invalid='ignore', divide='ignore'):
+                q = a * flat_areas ** b
+            values[row] = np.where(valid, q, np.nan).reshape(lats.shape)
+        return Regionalization(**values)
+
+    def get(self, lat, long, area):
+        result = self.query([float(lat)], [float(long)], [float(area)])
+        values = {row: float(value[0]) for row, value in result._asdict().items()}
+        if np.isnan(values['q710']):
+            raise RowNotFoundError("Ponto fora da área coberta pela base de regionalização")
+        return Regionalization(**{row: None if np.isnan(v) else v for row, v in values.items()})
+
+
+def unit_vectors(lats, lngs):
+    lat = np.radians(lats)
+    lng = np.radians(lngs)
+    return np.column_stack([np.cos(lat) * np.cos(lng), np.cos(lat) * np.sin(lng), np.sin(lat)])
+
+
+_default_cache = None
+_default_offline = None
+
+
+def default_cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = RegionalizationCache()
+    return _default_cache
+
+
+def default_offline():
+    global _default_offline
+    if _default_offline is None and REGIONALIZATION_DATASET and os.path.isfile(REGIONALIZATION_DATASET):
+        _default_offline = OfflineRegionalization.load(REGIONALIZATION_DATASET)
+    return _default_offline
+
+
+# Todas as vazões da tabela: cache, depois base offline (se configurada), depois o site.
+def get_regionalization(lat: float, long: float, area: float, cache=None) -> Regionalization:
+    cache = cache or default_cache()
+    result = cache.get(lat, long, area)
+    if result is not None:
+        return result
+    offline = default_offline()
+    if offline is not None:
+        try:
+            return offline.get(lat, long, area)
+        except RowNotFoundError:
+            pass
+    result = fetch_regionalization(lat, long, area)
+    cache.put(lat, long, area, result)
+    return result
+
+
+# Q7,10 para o ponto e a área de drenagem informados.
+def extract_value(lat: float, long: float, area: float, cache=None) -> float:
+    return get_regionalization(lat, long, area, cache).q710
@@ -0,0 +1,169 @@
+# Traçado das tubulações como polilinhas (seguindo cercas, estradas, curvas de nível) em vez
+# de uma reta entre os pontos.
+#
+# Cada segmento entre dois vértices tem seu próprio comprimento (com a diferença de cota entre
+# as pontas) e sua perda de carga (Darcy-Weisbach); o comprimento e a perda da tubulação são
+# as somas dos segmentos. Os resultados por segmento ficam guardados em arrays: mover um
+# vértice recalcula só os dois segmentos vizinhos a ele, inserir ou remover um vértice só os
+# segmentos que ele toca. Assim o arraste de vértices no mapa continua fluido mesmo em
+# traçados com centenas de vértices.
+#
+# Vazão, diâmetro e rugosidade são os mesmos em toda a tubulação, então o fator de atrito
+# também: a perda por metro é calculada uma vez (no início e em set_pipe()) e a perda de cada
+# segmento é proporcional ao seu comprimento. Os um ou dois segmentos de um movimento são
+# recalculados com math, em escalares; com NumPy, o custo fixo de cada chamada dominaria.
+from __future__ import annotations
+
+import math
+from typing import NamedTuple, Sequence
+
+import numpy as np
+
+from .geodesy import EARTH_RADIUS, haversine_array
+from .friction_table import head_loss_function
+
+
+class Segment(NamedTuple):
+    start: tuple[float, float]
+    end: tuple[float, float]
+    start_elevation: float
+    end_elevation: float
+    ground: float  # distância horizontal (m)
+    length: float  # comprimento considerando a diferença de cota (m)
+    loss: float    # perda de carga (m)
+
+
+# Distância horizontal e comprimento (m) dos segmentos entre vértices consecutivos.
+def segment_lengths(lats: np.ndarray, lngs: np.ndarray, elevations: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    ground = haversine_array(lats[:-1], lngs[:-1], lats[1:], lngs[1:])
+    return ground, np.hypot(ground, np.diff(elevations))
+
+
+# Distância horizontal (m) entre dois vértices, em escalares.
+def ground_distance(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    lat1, lng1, lat2, lng2 = math.radians(lat1), math.radians(lng1), math.radians(lat2), math.radians(lng2)
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return EARTH_RADIUS * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+# vertices: sequência de (lat, lng) com pelo menos dois vértices; elevations: cota (m) de cada
+# vértice. flow: vazão (m³/s); diameter: diâmetro interno (m); roughness: rugosidade (mm).
+# Com `friction_table`, o fator de atrito vem da tabela pré-calculada (friction_table).
+class Route:
+    def __init__(self, vertices: Sequence[tuple[float, float]], elevations: Sequence[float], flow: float = 0.0,
+                 diameter: float = 0.0254, roughness: float = 0.01, friction_table: bool = False):
+        vertices = np.asarray(vertices, dtype=np.float64)
+        if vertices.ndim != 2 or len(vertices) < 2:
+            raise ValueError("O trajeto precisa de pelo menos dois vértices (lat, lng)")
+        elevations = np.asarray(elevations, dtype=np.float64)
+        if elevations.shape != (len(vertices),):
+            raise ValueError("É preciso uma cota para cada vértice do trajeto")
+        self.lats = vertices[:, 0].copy()
+        self.lngs = vertices[:, 1].copy()
+        self.elevations = elevations.copy()
+        self.flow = flow
+        self.diameter = diameter
+        self.roughness = roughness
+        self._head_loss = head_loss_function(friction_table)
+        self._loss_per_metre = self._rate()
+        self.ground = np.zeros(len(vertices) - 1)
+        self.length = np.zeros(len(vertices) - 1)
+        self.loss = np.zeros(len(vertices) - 1)
+        self._update(0, len(self.length))
+
+    def __len__(self):
+        return len(self.lats)
+
+    @property
+    def vertices(self) -> list[tuple[float, float]]:
+        return list(zip(self.lats.tolist(), self.lngs.tolist()))
+
+    @property
+    def total_length(self) -> float:
+        return float(self.length.sum())
+
+    @property
+    def total_loss(self) -> float:
+        return float(self.loss.sum())
+
+    def segments(self) -> list[Segment]:
+        vertices = self.vertices
+        return [Segment(vertices[k], vertices[k + 1], float(self.elevations[k]), float(self.elevations[k + 1]),
+                        float(self.ground[k]), float(self.length[k]), float(self.loss[k]))
+                for k in range(len(self.length))]
+
+    # Mudar a tubulação (vazão, diâmetro ou material) muda a perda de todos os segmentos, mas não
+    # os comprimentos.
+    def set_pipe(self, flow: float, diameter: float, roughness: float) -> None:
+        self.flow = flow
+        self.diameter = diameter
+        self.roughness = roughness
+        self._loss_per_metre = self._rate()
+        self.loss[:] = self.length * self._loss_per_metre
+
+    # Sem `elevation`, o vértice mantém a cota anterior (por exemplo, durante o arraste, até a
+    # consulta da nova cota terminar).
+    def move_vertex(self, index: int, lat: float, lng: float, elevation: float | None = None) -> None:
+        index = self._index(index, len(self))
+        self.lats[index] = lat
+        self.lngs[index] = lng
+        if elevation is not None:
+            self.elevations[index] = elevation
+        self._update(max(index - 1, 0), min(index + 1, len(self.length)))
+
+    # Insere um vértice entre `index - 1` e `index`; as pontas do trajeto não mudam. Sem
+    # `elevation`, a cota é interpolada entre os vizinhos.
+    def insert_vertex(self, index: int, lat: float, lng: float, elevation: float | None = None) -> None:
+        if not 0 < index < len(self):
+            raise IndexError(f"vértice {index} fora do trajeto (1 a {len(self) - 1})")
+        if elevation is None:
+            before = ground_distance(self.lats[index - 1], self.lngs[index - 1], lat, lng)
+            after = ground_distance(lat, lng, self.lats[index], self.lngs[index])
+            weight = before / (before + after) if before + after > 0 else 0.5
+            elevation = self.elevations[index - 1] + (self.elevations[index] - self.elevations[index - 1]) * weight
+        self.lats = np.insert(self.lats, index, lat)
+        self.lngs = np.insert(self.lngs, index, lng)
+        self.elevations = np.insert(self.elevations, index, elevation)
+        self.ground = np.insert(self.ground, index, 0.0)
+        self.length = np.insert(self.length, index, 0.0)
+        self.loss = np.insert(self.loss, index, 0.0)
+        self._update(index - 1, index + 1)
+
+    # Remove um vértice interno; os dois segmentos vizinhos viram um só.
+    def remove_vertex(self, index: int) -> None:
+        if not 0 < index < len(self) - 1:
+            raise IndexError(f"vértice {index} não é um vértice interno do trajeto")
+        self.lats = np.delete(self.lats, index)
+        self.lngs = np.delete(self.lngs, index)
+        self.elevations = np.delete(self.elevations, index)
+        self.ground = np.delete(self.ground, index)
+        self.length = np.delete(self.length, index)
+        self.loss = np.delete(self.loss, index)
+        self._update(index - 1, index)
+
+    @staticmethod
+    def _index(index, size):
+        if not -size <= index < size:
+            raise IndexError(f"vértice {index} fora do trajeto ({size} vértices)")
+        return index % size
+
+    # Perda de carga (m) por metro de tubulação.
+    def _rate(self):
+        return float(self._head_loss(self.flow, self.diameter, 1.0, self.roughness))
+
+    # Recalcula os segmentos [first, last).
+    def _update(self, first, last):
+        if last - first <= 2:
+            lats, lngs, elevations = self.lats, self.lngs, self.elevations
+            for k in range(first, last):
+                ground = ground_distance(lats[k], lngs[k], lats[k + 1], lngs[k + 1])
+                length = math.hypot(ground, elevations[k + 1] - elevations[k])
+                self.ground[k] = ground
+                self.length[k] = length
+                self.loss[k] = length * self._loss_per_metre
+            return
+        vertices = slice(first, last + 1)
+        ground, length = segment_lengths(self.lats[vertices], self.lngs[vertices], self.elevations[vertices])
+        self.ground[first:last] = ground
+        self.length[first:last] = length
+        self.loss[first:last] = length * self._loss_per_metre
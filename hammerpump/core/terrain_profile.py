@@ -0,0 +1,99 @@
+# Perfil do terreno ao longo das tubulações de alimentação e de recalque.
+# O trajeto (reta ou polilinha) é amostrado em N pontos, as elevações vêm em uma única
+# consulta em lote e o perfil é refinado onde a declividade muda bruscamente.
+# Todo o cálculo é vetorizado com NumPy.
+from __future__ import annotations
+
+from typing import NamedTuple, Sequence
+
+import numpy as np
+
+from .geodesy import haversine_array
+
+# distance/elevation: distância acumulada (m) e cota (m) de cada amostra;
+# hgl: cota da linha piezométrica; above_hgl: amostras acima dela (ar na tubulação, sifão).
+class Profile(NamedTuple):
+    latitude: np.ndarray
+    longitude: np.ndarray
+    distance: np.ndarray
+    elevation: np.ndarray
+    hgl: np.ndarray
+    above_hgl: np.ndarray
+
+
+# Distância acumulada (m) ao longo dos vértices da polilinha.
+def route_distances(lats, lngs):
+    lats = np.asarray(lats, dtype=np.float64)
+    lngs = np.asarray(lngs, dtype=np.float64)
+    return np.concatenate([[0.0], np.cumsum(haversine_array(lats[:-1], lngs[:-1], lats[1:], lngs[1:]))])
+
+
+# Coordenadas dos pontos nas distâncias `distance` ao longo da polilinha.
+# Os segmentos são curtos, então a interpolação linear em lat/lng é suficiente.
+def interpolate_route(lats, lngs, cumulative, distance):
+    return np.interp(distance, cumulative, lats), np.interp(distance, cumulative, lngs)
+
+
+# Consulta em lote; usa a API vetorizada quando a fonte oferece (DEM).
+def lookup_elevations(source, lats, lngs):
+    if hasattr(source, 'elevations'):
+        values = source.elevations(lats, lngs)
+        if not np.isnan(values).any():
+            return values
+    return np.asarray(source.get_elevations(list(zip(lats.tolist(), lngs.tolist()))), dtype=np.float64)
+
+
+# Linha piezométrica reta entre as cargas (m) do início e do fim do trajeto.
+def hydraulic_grade_line(distance, start_head, end_head):
+    total = distance[-1] if distance[-1] > 0 else 1.0
+    return start_head + (end_head - start_head) * distance / total
+
+
+# `route` é uma sequência de (lat, lng) com pelo menos dois vértices.
+# start_head/end_head: carga no início e no fim (padrão: cota dos extremos).
+# Em cada passo de refinamento, os intervalos vizinhos a mudanças de declividade maiores
+# que `slope_tolerance` (m/m) recebem um ponto médio, até `max_points` amostras.
+def elevation_profile(route: Sequence[tuple[float, float]], source, samples: int = 100,
+                      start_head: float | None = None, end_head: float | None = None,
+                      slope_tolerance: float = 0.05, max_refinements: int = 3, max_points: int = 5000,
+                      clearance: float = 0.0) -> Profile:
+    vertices = np.asarray(route, dtype=np.float64)
+    if vertices.ndim != 2 or len(vertices) < 2:
+        raise ValueError("O trajeto precisa de pelo menos dois vértices (lat, lng)")
+    cumulative = route_distances(vertices[:, 0], vertices[:, 1])
+    # Amostras uniformes mais os próprios vértices da polilinha.
+    distance = np.union1d(np.linspace(0.0, cumulative[-1], max(samples, 2)), cumulative)
+    lats, lngs = interpolate_route(vertices[:, 0], vertices[:, 1], cumulative, distance)
+    elevation = lookup_elevations(source, lats, lngs)
+    for _ in range(max_refinements):
+        new_distance = refinement_points(distance, elevation, slope_tolerance)
+        new_distance = new_distance[:max(max_points - len(distance), 0)]
+        if len(new_distance) == 0:
+            break
+        new_lats, new_lngs = interpolate_route(vertices[:, 0], vertices[:, 1], cumulative, new_distance)
+        new_elevation = lookup_elevations(source, new_lats, new_lngs)
+        order = np.argsort(np.concatenate([distance, new_distance]), kind='stable')
+        distance = np.concatenate([distance, new_distance])[order]
+        lats = np.concatenate([lats, new_lats])[order]
+        lngs = np.concatenate([lngs, new_lngs])[order]
+        elevation = np.concatenate([elevation, new_elevation])[order]
+    if start_head is None:
+        start_head = elevation[0]
+    if end_head is None:
+        end_head = elevation[-1]
+    hgl = hydraulic_grade_line(distance, start_head, end_head)
+    return Profile(lats, lngs, distance, elevation, hgl, elevation > hgl + clearance)
+
+
+# Pontos médios dos intervalos adjacentes a uma mudança de declividade acima da tolerância.
+def refinement_points(distance, elevation, slope_tolerance):
+    step = np.diff(distance)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        slope = np.where(step > 0, np.diff(elevation) / step, 0.0)
+    change = np.abs(np.diff(slope)) > slope_tolerance
+    refine = np.zeros(len(step), dtype=bool)
+    refine[:-1] |= change
+    refine[1:] |= change
+    # Intervalos muito curtos (< 1 m) não são mais divididos.
+    refine &= step > 1.0
+    return distance[:-1][refine] + step[refine] / 2
@@ -0,0 +1,145 @@
+# Análise de incerteza (Monte Carlo) da vazão elevada por uma instalação.
+#
+# As elevações da API têm erro de alguns metros, a Q7,10 é uma estimativa estatística e o
+# comprimento real e a rugosidade das tubulações só são conhecidos aproximadamente. Cada
+# amostra sorteia esses valores e passa pelo mesmo cálculo da interface, vetorizado:
+# distâncias com altura, perdas de carga (Darcy-Weisbach) e vazão elevada (performance).
+#
+# As amostras são divididas em blocos de tamanho fixo, cada um com sua semente derivada de
+# `seed` (SeedSequence.spawn), então o resultado não depende do número de processos. Com
+# workers > 1 os blocos são calculados em um ProcessPoolExecutor e cada processo grava
+# direto em arrays de resultado em memória compartilhada (multiprocessing.shared_memory),
+# sem devolver os arrays pelo pipe. Com `friction_table`, as perdas usam o fator de atrito
+# da tabela pré-calculada (friction_table), carregada uma vez em cada processo.
+from __future__ import annotations
+
+import math
+import os
+from typing import NamedTuple
+
+import numpy as np
+
+from .geodesy import haversine_array
+from .performance import delivered_flow, pipe_losses
+from .pumps import MAX_DISTANCE, MAX_HEIGHT, PumpModel
+
+CHUNK_SIZE = 1 << 16
+
+# Linhas do array de resultados.
+DELIVERED, HEIGHT, DISTANCE = range(3)
+
+
+# Valores nominais da instalação. Pontos em (lat, lng); elevações (m) de fonte, bomba e
+# reservatório; drive_flow: vazão de alimentação (L/min); pipe_in/pipe_out: (diâmetro (m),
+# rugosidade (mm)) das tubulações de alimentação (fonte → bomba) e de recalque
+# (bomba → reservatório).
+class Site(NamedTuple):
+    source: tuple[float, float]
+    pump: tuple[float, float]
+    reservoir: tuple[float, float]
+    elevations: tuple[float, float, float]
+    drive_flow: float
+    model: PumpModel
+    pipe_in: tuple[float, float]
+    pipe_out: tuple[float, float]
+
+
+# Dispersão das entradas: desvio-padrão de cada elevação (m, normal); coeficiente de variação
+# da vazão (lognormal com a mesma média); variação relativa da rugosidade (uniforme, ±);
+# fator sobre a distância em linha reta até o comprimento real da tubulação (uniforme).
+class Spread(NamedTuple):
+    elevation_sd: float = 5.0
+    flow_cv: float = 0.3
+    roughness_range: float = 0.5
+    length_factor: tuple[float, float] = (1.0, 1.15)
+
+
+class UncertaintyResult(NamedTuple):
+    samples: int
+    p10: float  # vazão elevada (L/min)
+    p50: float
+    p90: float
+    mean: float
+    prob_not_operating: float
+    prob_height_exceeded: float    # altura bomba → reservatório > MAX_HEIGHT
+    prob_distance_exceeded: float  # distância bomba → reservatório > MAX_DISTANCE
+    delivered_flow: np.ndarray
+
+
+# Calcula `n` amostras; devolve array (3, n) com vazão elevada (L/min), altura e distância
+# bomba → reservatório (m).
+def simulate(site: Site, spread: Spread, n: int, rng: np.random.Generator,
+             friction_table: bool = False) -> np.ndarray:
+    model = site.model
+    z_source, z_pump, z_reservoir = np.asarray(site.elevations, dtype=np.float64)[:, None] + \
+        rng.normal(0.0, spread.elevation_sd, (3, n))
+    ground_in = haversine_array(*site.source, *site.pump)
+    ground_out = haversine_array(*site.pump, *site.reservoir)
+    factor = rng.uniform(*spread.length_factor, n)
+    supply_head = z_source - z_pump
+    delivery_head = z_reservoir - z_pump
+    length_in = np.hypot(ground_in * factor, supply_head)
+    length_out = np.hypot(ground_out * factor, delivery_head)
+
+    sigma = math.sqrt(math.log1p(spread.flow_cv ** 2))
+    drive_flow = site.drive_flow * rng.lognormal(-sigma ** 2 / 2, sigma, n)
+    roughness_in, roughness_out = np.array([site.pipe_in[1], site.pipe_out[1]])[:, None] * \
+        rng.uniform(1 - spread.roughness_range, 1 + spread.roughness_range, (2, n))
+
+    loss_in, loss_out = pipe_losses(model, drive_flow, supply_head, delivery_head,
+                                    (site.pipe_in[0], length_in, roughness_in),
+                                    (site.pipe_out[0], length_out, roughness_out), friction_table)
+    q = delivered_flow([model], drive_flow, supply_head, delivery_head, loss_in, loss_out)[0][0]
+    return np.stack([q, delivery_head, np.hypot(ground_out, delivery_head)])
+
+
+# Executado nos processos: anexa a memória compartilhada e grava o bloco [start, stop).
+def _simulate_chunk(name, total, start, stop, seed, site, spread, friction_table):
+    from multiprocessing import shared_memory
+
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        results = np.ndarray((3, total), dtype=np.float64, buffer=block.buf)
+        results[:, start:stop] = simulate(site, spread, stop - start, np.random.default_rng(seed), friction_table)
+        del results
+    finally:
+        block.close()
+
+
+def monte_carlo(site: Site, spread: Spread = Spread(), samples: int = 200_000, workers: int | None = None,
+                seed: int | None = None, chunk_size: int = CHUNK_SIZE,
+                friction_table: bool = False) -> UncertaintyResult:
+    if samples < 1:
+        raise ValueError(f"a análise de incerteza precisa de pelo menos uma amostra (samples={samples})")
+    bounds = list(range(0, samples, chunk_size)) + [samples]
+    chunks = list(zip(bounds[:-1], bounds[1:]))
+    seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+    workers = min(workers or os.cpu_count() or 1, len(chunks))
+    if workers <= 1:
+        results = np.empty((3, samples))
+        for (start, stop), chunk_seed in zip(chunks, seeds):
+            results[:, start:stop] = simulate(site, spread, stop - start, np.random.default_rng(chunk_seed),
+                                              friction_table)
+    else:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        from multiprocessing import shared_memory
+
+        block = shared_memory.SharedMemory(create=True, size=3 * samples * 8)
+        try:
+            # spawn: a análise é iniciada de uma thread da interface, e fork copiaria locks presos.
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+                futures = [executor.submit(_simulate_chunk, block.name, samples, start, stop, chunk_seed, site, spread,
+                                           friction_table)
+                           for (start, stop), chunk_seed in zip(chunks, seeds)]
+                for future in futures:
+                    future.result()
+            results = np.ndarray((3, samples), dtype=np.float64, buffer=block.buf).copy()
+        finally:
+            block.close()
+            block.unlink()
+    q = results[DELIVERED]
+    p10, p50, p90 = np.percentile(q, [10, 50, 90])
+    return UncertaintyResult(
+        samples, float(p10), float(p50), float(p90), float(q.mean()), float(np.mean(q <= 0)),
+        float(np.mean(results[HEIGHT] > MAX_HEIGHT)), float(np.mean(results[DISTANCE] > MAX_DISTANCE)), q)
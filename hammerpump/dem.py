@@ -0,0 +1,270 @@
+# Motor de elevação offline sobre modelos digitais de elevação (SRTM/Copernicus) locais.
+# Os tiles de 1°x1° são lidos com numpy.memmap (nada é carregado na memória até ser
+# consultado), os tiles abertos ficam num LRU e as consultas usam interpolação bilinear.
+#
+# Formatos aceitos:
+#   - SRTM .hgt (int16 big-endian, 3601x3601 para 1" ou 1201x1201 para 3");
+#   - GeoTIFF sem compressão e sem tiles internos (ex.: Copernicus GLO-30 convertido com
+#     `gdal_translate -co COMPRESS=NONE -co TILED=NO`), de banda única int16/float32.
+import math
+import os
+import re
+import struct
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .elevation import ElevationError
+
+HGT_NAME = re.compile(r'([NS])(\d{2})([EW])(\d{3})', re.IGNORECASE)
+HGT_NODATA = -32768
+
+# Tags TIFF/GeoTIFF usados pelo leitor.
+TIFF_TYPES = {1: 'B', 2: 's', 3: 'H', 4: 'I', 11: 'f', 12: 'd', 16: 'Q'}
+TAG_WIDTH, TAG_HEIGHT, TAG_BITS, TAG_COMPRESSION = 256, 257, 258, 259
+TAG_STRIP_OFFSETS, TAG_SAMPLES, TAG_STRIP_BYTES = 273, 277, 279
+TAG_TILE_WIDTH, TAG_SAMPLE_FORMAT = 322, 339
+TAG_PIXEL_SCALE, TAG_TIEPOINT, TAG_GEOKEYS, TAG_NODATA = 33550, 33922, 34735, 42113
+GEOKEY_RASTER_TYPE, RASTER_PIXEL_IS_POINT = 1025, 2
+
+
+class DEMError(ElevationError):
+    pass
+
+
+class Tile:
+    # `data` tem a linha 0 ao norte; (lat0, lon0) é o centro do pixel [0, 0].
+    def __init__(self, data, lat0, lon0, dlat, dlon, nodata=None):
+        self.data = data
+        self.lat0 = lat0
+        self.lon0 = lon0
+        self.dlat = dlat
+        self.dlon = dlon
+        self.nodata = nodata
+
+    # Caminho rápido para um único ponto (sem alocação de arrays).
+    def sample_point(self, lat, lon):
+        nrows, ncols = self.data.shape
+        r = min(max((self.lat0 - lat) / self.dlat, 0.0), nrows - 1.0)
+        c = min(max((lon - self.lon0) / self.dlon, 0.0), ncols - 1.0)
+        r0 = min(int(r), nrows - 2)
+        c0 = min(int(c), ncols - 2)
+        fr = r - r0
+        fc = c - c0
+        window = self.data[r0:r0 + 2, c0:c0 + 2].tolist()
+        total = value = 0.0
+        for (dr, dc), weight in (((0, 0), (1 - fr) * (1 - fc)), ((0, 1), (1 - fr) * fc),
+                                 ((1, 0), fr * (1 - fc)), ((1, 1), fr * fc)):
+            z = window[dr][dc]
+            if z == self.nodata or z != z:
+                continue
+            total += weight
+            value += weight * z
+        return value / total if total > 0 else None
+
+    # Interpolação bilinear vetorizada; NaN onde não há dado válido.
+    def sample(self, lats, lons):
+        nrows, ncols = self.data.shape
+        r = np.clip((self.lat0 - lats) / self.dlat, 0, nrows - 1)
+        c = np.clip((lons - self.lon0) / self.dlon, 0, ncols - 1)
+        r0 = np.minimum(np.floor(r).astype(np.intp), nrows - 2)
+        c0 = np.minimum(np.floor(c).astype(np.intp), ncols - 2)
+        fr = r - r0
+        fc = c - c0
+        values = np.stack([self.data[r0, c0], self.data[r0, c0 + 1],
+                           self.data[r0 + 1, c0], self.data[r0 + 1, c0 + 1]]).astype(np.float64)
+        weights = np.stack([(1 - fr) * (1 - fc), (1 - fr) * fc, fr * (1 - fc), fr * fc])
+        valid = np.isfinite(values)
+        if self.nodata is not None:
+            valid &= values != self.nodata
+        weights = np.where(valid, weights, 0.0)
+        total = weights.sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result = (np.where(valid, values, 0.0) * weights).sum(axis=0) / total
+        return np.where(total > 0, result, np.nan)
+
+
+def open_hgt(path):
+    match = HGT_NAME.search(os.path.basename(path))
+    if match is None:
+        raise DEMError(f"Nome de tile SRTM inválido: {path}")
+    size = math.isqrt(os.path.getsize(path) // 2)
+    if size * size * 2 != os.path.getsize(path):
+        raise DEMError(f"Tamanho de arquivo .hgt inesperado: {path}")
+    south, west = hgt_origin(match)
+    data = np.memmap(path, dtype='>i2', mode='r', shape=(size, size))
+    step = 1.0 / (size - 1)
+    return Tile(data, south + 1, west, step, step, HGT_NODATA)
+
+
+def hgt_origin(match):
+    lat = int(match.group(2)) * (1 if match.group(1).upper() == 'N' else -1)
+    lon = int(match.group(4)) * (1 if match.group(3).upper() == 'E' else -1)
+    return lat, lon
+
+
+def read_tiff_header(path):
+    with open(path, 'rb') as f:
+        head = f.read(8)
+        order = {b'II': '<', b'MM': '>'}.get(head[:2])
+        if order is None or struct.unpack(order + 'H', head[2:4])[0] != 42:
+            raise DEMError(f"Arquivo não é um TIFF clássico: {path}")
+        f.seek(struct.unpack(order + 'I', head[4:8])[0])
+        count = struct.unpack(order + 'H', f.read(2))[0]
+        entries = [struct.unpack(order + 'HHII', f.read(12)) for _ in range(count)]
+        tags = {}
+        for tag, kind, n, value in entries:
+            fmt = TIFF_TYPES.get(kind)
+            if fmt is None:
+                continue
+            size = struct.calcsize(fmt) * n
+            if size <= 4:
+                raw = struct.pack(order + 'I', value)[:size]
+            else:
+                f.seek(value)
+                raw = f.read(size)
+            if fmt == 's':
+                tags[tag] = raw.rstrip(b'\0').decode('ascii', 'replace')
+            else:
+                tags[tag] = struct.unpack(order + fmt * n, raw)
+    return order, tags
+
+
+def open_geotiff(path):
+    order, tags = read_tiff_header(path)
+    if tags.get(TAG_COMPRESSION, (1,))[0] != 1 or TAG_TILE_WIDTH in tags:
+        raise DEMError(f"GeoTIFF comprimido ou em tiles não pode ser mapeado: {path}")
+    if tags.get(TAG_SAMPLES, (1,))[0] != 1:
+        raise DEMError(f"GeoTIFF com mais de uma banda: {path}")
+    width, height = tags[TAG_WIDTH][0], tags[TAG_HEIGHT][0]
+    bits = tags[TAG_BITS][0]
+    sample_format = tags.get(TAG_SAMPLE_FORMAT, (1,))[0]
+    dtype = {(16, 2): 'i2', (16, 1): 'u2', (32, 3): 'f4', (32, 2): 'i4', (64, 3): 'f8'}.get((bits, sample_format))
+    if dtype is None:
+        raise DEMError(f"Tipo de pixel não suportado ({bits} bits, formato {sample_format}): {path}")
+    offsets = tags[TAG_STRIP_OFFSETS]
+    byte_counts = tags[TAG_STRIP_BYTES]
+    # As faixas precisam ser contíguas para que a imagem inteira vire um único memmap.
+    for offset, count, following in zip(offsets, byte_counts, offsets[1:]):
+        if offset + count != following:
+            raise DEMError(f"Faixas do GeoTIFF não são contíguas: {path}")
+    data = np.memmap(path, dtype=order + dtype, mode='r', offset=offsets[0], shape=(height, width))
+    sx, sy = tags[TAG_PIXEL_SCALE][:2]
+    i, j, _, x, y, _ = tags[TAG_TIEPOINT][:6]
+    lon0 = x - i * sx
+    lat0 = y + j * sy
+    if geokey(tags, GEOKEY_RASTER_TYPE) != RASTER_PIXEL_IS_POINT:
+        lon0 += sx / 2
+        lat0 -= sy / 2
+    nodata = float(tags[TAG_NODATA]) if TAG_NODATA in tags else None
+    return Tile(data, lat0, lon0, sy, sx, nodata)
+
+
+def geokey(tags, key):
+    directory = tags.get(TAG_GEOKEYS, ())
+    for k in range(4, len(directory), 4):
+        if directory[k] == key and directory[k + 1] == 0:
+            return directory[k + 3]
+    return None
+
+
+def tiff_origin(path):
+    tile = open_geotiff(path)
+    nrows, ncols = tile.data.shape
+    center_lat = tile.lat0 - tile.dlat * (nrows - 1) / 2
+    center_lon = tile.lon0 + tile.dlon * (ncols - 1) / 2
+    return math.floor(center_lat), math.floor(center_lon)
+
+
+class DEM:
+    def __init__(self, directory, max_open_tiles=8, fallback=None):
+        self.directory = directory
+        self.max_open_tiles = max_open_tiles
+        # Fonte usada para pontos fora dos tiles locais (ex.: ElevationClient).
+        self.fallback = fallback
+        self._open = OrderedDict()
+        self._lock = threading.Lock()
+        self._paths = self._index(directory)
+
+    # Mapeia (lat, lon) do canto sudoeste de cada tile para o arquivo correspondente.
+    @staticmethod
+    def _index(directory):
+        paths = {}
+        for root, _, files in os.walk(directory):
+            for name in files:
+                path = os.path.join(root, name)
+                extension = os.path.splitext(name)[1].lower()
+                try:
+                    if extension == '.hgt':
+                        match = HGT_NAME.search(name)
+                        if match:
+                            paths[hgt_origin(match)] = path
+                    elif extension in ('.tif', '.tiff'):
+                        paths[tiff_origin(path)] = path
+                except (DEMError, KeyError, OSError, struct.error) as e:
+                    print(f"Tile ignorado ({path}): {e}")
+        return paths
+
+    def tile(self, key):
+        with self._lock:
+            return self._tile(key)
+
+    def _tile(self, key):
+        tile = self._open.get(key)
+        if tile is not None:
+            self._open.move_to_end(key)
+            return tile
+        path = self._paths.get(key)
+        if path is None:
+            return None
+        tile = open_hgt(path) if path.lower().endswith('.hgt') else open_geotiff(path)
+        self._open[key] = tile
+        if len(self._open) > self.max_open_tiles:
+            self._open.popitem(last=False)
+        return tile
+
+    def covers(self, lat, lng):
+        return (math.floor(lat), math.floor(lng)) in self._paths
+
+    # Consulta vetorizada: arrays de latitudes e longitudes → array de elevações (NaN sem dado).
+    def elevations(self, lats, lngs):
+        lats = np.asarray(lats, dtype=np.float64)
+        lngs = np.asarray(lngs, dtype=np.float64)
+        lats, lngs = np.broadcast_arrays(lats, lngs)
+        result = np.full(lats.shape, np.nan)
+        flat_lats = lats.ravel()
+        flat_lngs = lngs.ravel()
+        flat_result = result.reshape(-1)
+        keys = np.stack([np.floor(flat_lats), np.floor(flat_lngs)], axis=1).astype(np.int64)
+        unique, inverse = np.unique(keys, axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+        for k, (lat, lng) in enumerate(unique):
+            tile = self.tile((int(lat), int(lng)))
+            if tile is None:
+                continue
+            mask = inverse == k
+            flat_result[mask] = tile.sample(flat_lats[mask], flat_lngs[mask])
+        return result
+
+    def elevation(self, lat, lng):
+        tile = self.tile((math.floor(lat), math.floor(lng)))
+        return None if tile is None else tile.sample_point(float(lat), float(lng))
+
+    # Mesma interface de ElevationClient.get_elevations.
+    def get_elevations(self, locations):
+        locations = [(float(lat), float(lng)) for lat, lng in locations]
+        if not locations:
+            return []
+        values = self.elevations([p[0] for p in locations], [p[1] for p in locations])
+        result = [None if math.isnan(v) else float(v) for v in values]
+        missing = [i for i, value in enumerate(result) if value is None]
+        if missing:
+            if self.fallback is None:
+                raise DEMError("Ponto fora dos tiles de elevação disponíveis")
+            for i, value in zip(missing, self.fallback.get_elevations([locations[i] for i in missing])):
+                result[i] = value
+        return result
+
+    def get_elevation(self, lat, lng):
+        return self.get_elevations([(lat, lng)])[0]
@@ -0,0 +1,124 @@
+# Cliente da Google Elevation API.
+# Mantém uma única sessão HTTP (conexões reaproveitadas) e agrupa vários pontos
+# em requisições com múltiplas localizações separadas por "|". Com um ElevationCache,
+# só os pontos ausentes do cache vão para a rede.
+import os
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .elevation_cache import ElevationCache
+from .settings import API_KEY, BASE_URL, DEM_DIR, REQUEST_TIMEOUT
+
+# Limites documentados da API por requisição.
+MAX_LOCATIONS_PER_REQUEST = 512
+MAX_URL_LENGTH = 16384
+
+
+class ElevationError(Exception):
+    pass
+
+
+def format_location(lat, lng):
+    return f"{float(lat):.6f},{float(lng):.6f}"
+
+
+class ElevationClient:
+    def __init__(self, api_key=API_KEY, base_url=BASE_URL, timeout=REQUEST_TIMEOUT,
+                 chunk_size=MAX_LOCATIONS_PER_REQUEST, session=None, cache=None):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.timeout = timeout
+        self.chunk_size = min(chunk_size, MAX_LOCATIONS_PER_REQUEST)
+        if session is None:
+            session = requests.Session()
+            session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=2))
+        self.session = session
+        self.cache = cache
+        self._pending = []
+
+    # Enfileira um ponto e devolve sua posição no próximo flush().
+    def add(self, lat, lng):
+        self._pending.append((float(lat), float(lng)))
+        return len(self._pending) - 1
+
+    # Resolve todos os pontos pendentes de uma vez, na ordem em que foram adicionados.
+    def flush(self):
+        points, self._pending = self._pending, []
+        return self.get_elevations(points)
+
+    def get_elevation(self, lat, lng):
+        return self.get_elevations([(lat, lng)])[0]
+
+    # Devolve as elevações (m) na mesma ordem de `locations`.
+    def get_elevations(self, locations):
+        locations = [(float(lat), float(lng)) for lat, lng in locations]
+        elevations = [None] * len(locations)
+        if self.cache is not None:
+            elevations = self.cache.get_many(locations)
+        missing = [i for i, elevation in enumerate(elevations) if elevation is None]
+        if not missing:
+            return elevations
+        try:
+            fetched = self._fetch([locations[i] for i in missing])
+        except ElevationError:
+            # Sem rede: usa entradas vencidas do cache, se houver para todos os pontos.
+            if self.cache is None:
+                raise
+            stale = self.cache.get_many([locations[i] for i in missing], allow_stale=True, count=False)
+            if any(elevation is None for elevation in stale):
+                raise
+            fetched = stale
+        else:
+            if self.cache is not None:
+                self.cache.put_many([(*locations[i], elevation) for i, elevation in zip(missing, fetched)])
+        for i, elevation in zip(missing, fetched):
+            elevations[i] = elevation
+        return elevations
+
+    def _fetch(self, locations):
+        locations = [format_location(lat, lng) for lat, lng in locations]
+        # Pontos repetidos são consultados uma única vez.
+        unique = list(dict.fromkeys(locations))
+        resolved = {}
+        for chunk in self._chunks(unique):
+            for location, elevation in zip(chunk, self._request(chunk)):
+                resolved[location] = elevation
+        return [resolved[location] for location in locations]
+
+    def _chunks(self, locations):
+        chunk, length = [], len(self.base_url) + len(self.api_key) + 32
+        for location in locations:
+            size = len(location) + 3  # "|" codificado como %7C
+            if chunk and (len(chunk) >= self.chunk_size or length + size > MAX_URL_LENGTH):
+                yield chunk
+                chunk, length = [], len(self.base_url) + len(self.api_key) + 32
+            chunk.append(location)
+            length += size
+        if chunk:
+            yield chunk
+
+    def _request(self, chunk):
+        params = {
+            'locations': '|'.join(chunk),
+            'key': self.api_key
+        }
+        try:
+            response = self.session.get(self.base_url, params=params, timeout=self.timeout)
+            response.raise_for_status()
+            data = response.json()
+        except (requests.RequestException, ValueError) as e:
+            raise ElevationError(f"Falha ao consultar a Elevation API: {e}") from e
+        results = data.get('results') or []
+        if data.get('status') != 'OK' or len(results) != len(chunk):
+            raise ElevationError(f"Obtenção de dados indisponível ({data.get('status')})")
+        return [result['elevation'] for result in results]
+
+
+# Fonte de elevação padrão: DEM local (se configurado) com a API + cache como reserva.
+def default_elevation_source():
+    client = ElevationClient(cache=ElevationCache())
+    if DEM_DIR and os.path.isdir(DEM_DIR):
+        from .dem import DEM
+        return DEM(DEM_DIR, fallback=client)
+    return client
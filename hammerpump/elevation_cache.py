@@ -0,0 +1,137 @@
+# Cache persistente de elevações em SQLite (modo WAL).
+# As chaves são a latitude/longitude quantizadas em `precision` casas decimais; as entradas
+# guardam a data de obtenção (validade) e de último acesso (descarte LRU).
+#
+# O número de entradas é acompanhado em memória (as inserções novas contam, as substituições
+# não) e refeito com COUNT(*) a cada RECOUNT_INTERVAL inserções, por causa de outros processos
+# que usam o mesmo arquivo; o descarte só consulta a tabela quando o limite é ultrapassado.
+import os
+import sqlite3
+import threading
+import time
+
+from .settings import (CACHE_DIR, ELEVATION_CACHE_MAX_ENTRIES, ELEVATION_CACHE_PRECISION,
+                      ELEVATION_CACHE_TTL)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS elevations (
+    lat_q INTEGER NOT NULL,
+    lng_q INTEGER NOT NULL,
+    elevation REAL NOT NULL,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (lat_q, lng_q)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS elevations_accessed_at ON elevations (accessed_at);
+"""
+
+RECOUNT_INTERVAL = 1000
+
+
+class ElevationCache:
+    def __init__(self, path=None, precision=ELEVATION_CACHE_PRECISION,
+                 max_entries=ELEVATION_CACHE_MAX_ENTRIES, ttl=ELEVATION_CACHE_TTL):
+        if path is None:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            path = os.path.join(CACHE_DIR, 'elevations.sqlite')
+        self.path = path
+        self.precision = precision
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._scale = 10 ** precision
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(SCHEMA)
+        self._count = self._conn.execute('SELECT COUNT(*) FROM elevations').fetchone()[0]
+        self._inserted = 0
+
+    def key(self, lat, lng):
+        return round(float(lat) * self._scale), round(float(lng) * self._scale)
+
+    # Devolve as elevações na ordem de `locations` (None para ausentes ou vencidas).
+    # Com allow_stale=True as entradas vencidas também são aceitas (uso sem rede); com
+    # count=False a consulta não entra nas estatísticas (nova tentativa de pontos já contados).
+    def get_many(self, locations, allow_stale=False, count=True):
+        keys = [self.key(lat, lng) for lat, lng in locations]
+        now = time.time()
+        found = {}
+        with self._lock:
+            for key in set(keys):
+                row = self._conn.execute(
+                    'SELECT elevation, fetched_at FROM elevations WHERE lat_q = ? AND lng_q = ?', key).fetchone()
+                if row is not None and (allow_stale or now - row[1] <= self.ttl):
+                    found[key] = row[0]
+            if found:
+                self._conn.executemany(
+                    'UPDATE elevations SET accessed_at = ? WHERE lat_q = ? AND lng_q = ?',
+                    [(now, *key) for key in found])
+                self._conn.commit()
+            result = [found.get(key) for key in keys]
+            if count:
+                hits = sum(value is not None for value in result)
+                self.hits += hits
+                self.misses += len(result) - hits
+        return result
+
+    def get(self, lat, lng, allow_stale=False):
+        return self.get_many([(lat, lng)], allow_stale)[0]
+
+    # `items` é uma sequência de (lat, lng, elevação).
+    def put_many(self, items):
+        now = time.time()
+        rows = [(*self.key(lat, lng), float(elevation), now, now) for lat, lng, elevation in items]
+        with self._lock:
+            # INSERT OR IGNORE e depois UPDATE, em vez de INSERT OR REPLACE: total_changes conta
+            # exatamente as entradas novas.
+            changes = self._conn.total_changes
+            self._conn.executemany(
+                'INSERT OR IGNORE INTO elevations (lat_q, lng_q, elevation, fetched_at, accessed_at) '
+                'VALUES (?, ?, ?, ?, ?)', rows)
+            added = self._conn.total_changes - changes
+            if added < len(rows):
+                self._conn.executemany(
+                    'UPDATE elevations SET elevation = ?, fetched_at = ?, accessed_at = ? '
+                    'WHERE lat_q = ? AND lng_q = ?',
+                    [(*values, lat_q, lng_q) for lat_q, lng_q, *values in rows])
+            self._count += added
+            self._inserted += added
+            if self._inserted >= RECOUNT_INTERVAL:
+                self._count = self._conn.execute('SELECT COUNT(*) FROM elevations').fetchone()[0]
+                self._inserted = 0
+            self._evict()
+            self._conn.commit()
+
+    def put(self, lat, lng, elevation):
+        self.put_many([(lat, lng, elevation)])
+
+    # Remove as entradas usadas há mais tempo até respeitar o limite de tamanho.
+    def _evict(self):
+        excess = self._count - self.max_entries
+        if excess > 0:
+            self._count -= self._conn.execute(
+                'DELETE FROM elevations WHERE (lat_q, lng_q) IN '
+                '(SELECT lat_q, lng_q FROM elevations ORDER BY accessed_at LIMIT ?)', (excess,)).rowcount
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM elevations').fetchone()[0]
+
+    def stats(self):
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        return {'hits': hits, 'misses': misses, 'entries': len(self)}
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute('DELETE FROM elevations')
+            self._conn.commit()
+            self._count = self._inserted = 0
+            self.hits = self.misses = 0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
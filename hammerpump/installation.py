@@ -0,0 +1,109 @@
+# Cálculos de um local de instalação (fonte, bomba e reservatório), sem interface gráfica.
+#
+# Funções dos nós do grafo de resultados (hammerpump.reactive) e define_nodes(), que monta
+# esse grafo; usados pela Tela, que liga os nós aos campos, e pelos relatórios, que avaliam
+# projetos salvos sem Qt. Unidades da Tela: vazão de alimentação em L/min, vazão elevada dos
+# modelos (flow_max) em L/h, diâmetros em polegadas.
+from typing import NamedTuple
+
+import numpy as np
+
+from .core import (MATERIAL_ROUGHNESS, elevation_profile, extract_value, haversine_with_height_array,
+                   parse_inches, perda_de_carga_Darcy_Weisbach, select_pump, to_cubic_metres_per_second)
+
+POINTS = ('fonte', 'bomba', 'reservatorio')
+
+# Pontas de cada tubulação: alimentação (fonte → bomba) e recalque (bomba → reservatório).
+ROUTE_ENDS = {
+    'entrada': ('fonte', 'bomba'),
+    'saida': ('bomba', 'reservatorio'),
+}
+
+# Entradas do grafo além dos pontos.
+INPUTS = ('area', 'vazao', 'tubo_entrada', 'tubo_saida', 'material_entrada', 'material_saida')
+
+
+# Perdas nas tubulações de entrada e de saída; cada argumento é (Q, D, L, rugosidade).
+def calcular_perdas(entrada, saida):
+    return perda_de_carga_Darcy_Weisbach(*entrada), perda_de_carga_Darcy_Weisbach(*saida)
+
+
+# Distâncias (com a diferença de altura) e desníveis entre fonte, reservatório e bomba.
+class Geometria(NamedTuple):
+    distancia_fr: float  # fonte → reservatório
+    distancia_fb: float  # fonte → bomba
+    distancia_br: float  # bomba → reservatório
+    altura_fr: float     # fonte acima do reservatório
+    altura_fb: float     # fonte acima da bomba
+    altura_br: float     # reservatório acima da bomba
+
+
+# Pontos em (lat, lng); as três distâncias saem de uma só chamada vetorizada.
+def calcular_geometria(fonte, reservatorio, bomba, elevationfonte, elevationreservatorio, elevationpump):
+    lats = np.array([fonte[0], reservatorio[0], bomba[0]], dtype=np.float64)
+    lngs = np.array([fonte[1], reservatorio[1], bomba[1]], dtype=np.float64)
+    alts = np.array([elevationfonte, elevationreservatorio, elevationpump], dtype=np.float64)
+    origin, target = [0, 0, 1], [1, 2, 2]
+    distancia_fr, distancia_fb, distancia_br = haversine_with_height_array(
+        lats[origin], lngs[origin], alts[origin], lats[target], lngs[target], alts[target]).tolist()
+    return Geometria(distancia_fr, distancia_fb, distancia_br, elevationfonte - elevationreservatorio,
+                     elevationfonte - elevationpump, elevationreservatorio - elevationpump)
+
+
+def consultar_q710(fonte, area):
+    return extract_value(fonte[0], fonte[1], area)
+
+
+# Vazão (m³/s), diâmetro (m) e rugosidade (mm) de uma tubulação; `unidade` da vazão como em
+# core.FLOW_UNITS.
+def parametros_tubulacao(vazao, tubo, material, unidade='L/min'):
+    return (to_cubic_metres_per_second(vazao, unidade), parse_inches(tubo) * 0.0254,
+            float(MATERIAL_ROUGHNESS[material]))
+
+
+# Comprimento (m) de cada tubulação em reta entre as suas pontas (ROUTE_ENDS), com a diferença
+# de cota: fonte → bomba na alimentação, bomba → reservatório no recalque. Com as tubulações
+# traçadas, os comprimentos passam a ser os dos traçados (core.Route), entre as mesmas pontas.
+def comprimentos_retos(geometria):
+    return {'entrada': geometria.distancia_fb, 'saida': geometria.distancia_br}
+
+
+# Perdas nas duas tubulações sem traçado, com os comprimentos em reta.
+def calcular_perdas_instalacao(entrada, saida, geometria):
+    (Q1, D1, rugosidade), (Q2, D2, rugosidade2) = entrada, saida
+    comprimentos = comprimentos_retos(geometria)
+    return calcular_perdas((Q1, D1, comprimentos['entrada'], rugosidade), (Q2, D2, comprimentos['saida'], rugosidade2))
+
+
+# Perfis das tubulações de alimentação (fonte → bomba) e de recalque (bomba → reservatório);
+# cada trajeto é a lista de vértices (lat, lng) da tubulação, pontas incluídas.
+def calcular_perfis(source, entrada, saida, elevationfonte, elevationpump, elevationreservatorio):
+    # Alimentação: queda livre da fonte até a bomba.
+    profile_in = elevation_profile(entrada, source, start_head=elevationfonte, end_head=elevationpump)
+    # Recalque: carga estática do reservatório ao longo de toda a tubulação.
+    profile_out = elevation_profile(saida, source, start_head=elevationreservatorio, end_head=elevationreservatorio)
+    return profile_in, profile_out
+
+
+# Nós do grafo de um local: entradas (pontos e INPUTS), elevações e Q7,10 (consultas em
+# segundo plano), geometria, modelo da bomba, parâmetros das tubulações e perdas.
+# lookup_elevations(pontos) devolve as cotas (m) de uma lista de pontos (lat, lng); as
+# elevações pendentes de vários pontos são consultadas juntas, em uma só chamada.
+def define_nodes(graph, lookup_elevations, lookup_q710=consultar_q710):
+    graph.batch('elevacao', lambda args: lookup_elevations([point for point, in args]))
+    for name in POINTS:
+        graph.input(name)
+        graph.node(f'elevacao_{name}', lambda point: lookup_elevations([point])[0], [name], background=True,
+                   batch='elevacao')
+    for name in INPUTS:
+        graph.input(name)
+    graph.node('geometria', calcular_geometria,
+               ['fonte', 'reservatorio', 'bomba', 'elevacao_fonte', 'elevacao_reservatorio', 'elevacao_bomba'])
+    graph.node('q710', lookup_q710, ['fonte', 'area'], background=True)
+    graph.node('modelo', select_pump, ['vazao'])
+    graph.node('parametros_entrada', parametros_tubulacao, ['vazao', 'tubo_entrada', 'material_entrada'])
+    graph.node('parametros_saida',
+               lambda pump, tubo, material: parametros_tubulacao(pump.flow_max, tubo, material, 'L/h'),
+               ['modelo', 'tubo_saida', 'material_saida'])
+    graph.node('perdas', calcular_perdas_instalacao, ['parametros_entrada', 'parametros_saida', 'geometria'])
+    return graph
@@ -0,0 +1,222 @@
+# Modelo HTML pré-renderizado do mapa da interface.
+#
+# A árvore do folium (mapa, tiles, plugin Geocoder e o JS da ponte com a interface) é montada
+# uma única vez e salva no diretório de cache com as coordenadas iniciais trocadas por
+# marcadores. Nas execuções seguintes o modelo é lido do disco e só as coordenadas são
+# injetadas; folium nem chega a ser importado.
+#
+# O nome do arquivo leva um hash de tudo o que define o HTML (versão do modelo, versões do
+# folium/branca, URL dos tiles, zoom e o JS da ponte); mudar qualquer um deles gera um
+# modelo novo e os antigos são apagados.
+import functools
+import glob
+import hashlib
+import json
+import os
+from importlib import metadata
+
+from .settings import CACHE_DIR, TILE_URL
+
+TEMPLATE_VERSION = 1
+
+MAP_TILES = TILE_URL
+MAP_ATTRIBUTION = 'Esri'
+MAP_ZOOM = 15
+
+# Coordenadas usadas na renderização e trocadas pelos marcadores no modelo salvo.
+SENTINEL = (12.3456789, 98.7654321)
+LAT_MARKER = '__HAMMERPUMP_LAT__'
+LNG_MARKER = '__HAMMERPUMP_LNG__'
+
+# Liga o mapa à ponte QWebChannel da interface (map_bridge.MapBridge): cliques, movimento do
+# mouse, marcadores arrastáveis, traçados das tubulações e posições sugeridas para a bomba.
+# Movimento e arraste são agrupados em no máximo um envio por quadro de animação, sempre com a
+# posição mais recente. O mapa também fica acessível como window.hammerpumpMap para consultar
+# a região visível. Fora do QtWebEngine (sem `qt`), só o mapa é exibido. __MAP__ é trocado
+# pelo nome da variável do mapa no folium.
+BRIDGE_JS = """window.hammerpumpMap = __MAP__;
+(function (map) {
+    var bridge = null;
+    var markers = {};
+
+    function coalesce(send) {
+        var latest = null;
+        return function () {
+            var scheduled = latest !== null;
+            latest = arguments;
+            if (!scheduled) {
+                requestAnimationFrame(function () {
+                    var args = latest;
+                    latest = null;
+                    send.apply(null, args);
+                });
+            }
+        };
+    }
+
+    window.hammerpumpSetMarker = function (name, lat, lng) {
+        var marker = markers[name];
+        if (marker) {
+            marker.setLatLng([lat, lng]);
+            return;
+        }
+        marker = L.marker([lat, lng], {draggable: true, title: name}).addTo(map);
+        var drag = coalesce(function (lat, lng) {
+            if (bridge) { bridge.markerDragged(name, lat, lng); }
+        });
+        marker.on('drag', function (e) {
+            var p = e.target.getLatLng();
+            drag(p.lat, p.lng);
+        });
+        marker.on('dragend', function (e) {
+            var p = e.target.getLatLng();
+            if (bridge) { bridge.markerMoved(name, p.lat, p.lng); }
+        });
+        markers[name] = marker;
+    };
+
+    // Posições sugeridas para a bomba; clicar em uma equivale a soltar o marcador "bomba" nela.
+    var candidates = null;
+    window.hammerpumpShowCandidates = function (items) {
+        if (candidates) { map.removeLayer(candidates); }
+        candidates = L.layerGroup().addTo(map);
+        items.forEach(function (c) {
+            L.circleMarker([c.lat, c.lng], {radius: 7, color: '#ff7f0e', fillOpacity: 0.8})
+                .bindTooltip(c.label)
+                .on('click', function () { if (bridge) { bridge.markerMoved('bomba', c.lat, c.lng); } })
+                .addTo(candidates);
+        });
+    };
+
+    // Traçados das tubulações: cada vértice interno é um marcador arrastável; clicar na linha
+    // insere um vértice e o botão direito sobre um vértice o remove. As pontas acompanham os
+    // marcadores dos pontos. Durante o arraste só a linha é atualizada aqui; a interface
+    // recalcula os dois segmentos vizinhos e redesenha o traçado quando os vértices mudam.
+    var routes = {};
+    var vertexIcon = L.divIcon({className: '', iconSize: [12, 12],
+        html: '<div style="width:10px;height:10px;background:#fff;border:2px solid #1f77b4"></div>'});
+
+    function closestSegment(points, latlng) {
+        var p = map.latLngToLayerPoint(latlng);
+        var best = 0;
+        var bestDistance = Infinity;
+        for (var k = 0; k < points.length - 1; k++) {
+            var d = L.LineUtil.pointToSegmentDistance(
+                p, map.latLngToLayerPoint(points[k]), map.latLngToLayerPoint(points[k + 1]));
+            if (d < bestDistance) {
+                bestDistance = d;
+                best = k;
+            }
+        }
+        return best;
+    }
+
+    window.hammerpumpSetRoute = function (name, points) {
+        if (routes[name]) { map.removeLayer(routes[name]); }
+        var layer = routes[name] = L.layerGroup().addTo(map);
+        var line = L.polyline(points, {color: '#1f77b4', weight: 4}).addTo(layer);
+        line.on('click', function (e) {
+            L.DomEvent.stopPropagation(e);
+            var index = closestSegment(points, e.latlng) + 1;
+            if (bridge) { bridge.routeVertexInserted(name, index, e.latlng.lat, e.latlng.lng); }
+        });
+        points.slice(1, -1).forEach(function (point, n) {
+            var index = n + 1;
+            var vertex = L.marker(point, {draggable: true, icon: vertexIcon}).addTo(layer);
+            var drag = coalesce(function (lat, lng) {
+                if (bridge) { bridge.routeVertexDragged(name, index, lat, lng); }
+            });
+            vertex.on('drag', function (e) {
+                var p = e.target.getLatLng();
+                points[index] = [p.lat, p.lng];
+                line.setLatLngs(points);
+                drag(p.lat, p.lng);
+            });
+            vertex.on('dragend', function (e) {
+                var p = e.target.getLatLng();
+                if (bridge) { bridge.routeVertexMoved(name, index, p.lat, p.lng); }
+            });
+            vertex.on('contextmenu', function () {
+                if (bridge) { bridge.routeVertexRemoved(name, index); }
+            });
+        });
+    };
+
+    if (typeof QWebChannel === 'undefined' || typeof qt === 'undefined') {
+        return;
+    }
+    new QWebChannel(qt.webChannelTransport, function (channel) {
+        bridge = channel.objects.bridge;
+        var hover = coalesce(function (lat, lng) { bridge.hover(lat, lng); });
+        map.on('click', function (e) { bridge.click(e.latlng.lat, e.latlng.lng); });
+        map.on('mousemove', function (e) { hover(e.latlng.lat, e.latlng.lng); });
+    });
+})(__MAP__);"""
+
+
+class MapTemplateError(Exception):
+    pass
+
+
+def _version(package):
+    try:
+        return metadata.version(package)
+    except metadata.PackageNotFoundError:
+        return ''
+
+
+def template_key(tiles=MAP_TILES, zoom=MAP_ZOOM):
+    content = json.dumps([TEMPLATE_VERSION, _version('folium'), _version('branca'),
+                          tiles, MAP_ATTRIBUTION, zoom, BRIDGE_JS, SENTINEL])
+    return hashlib.sha256(content.encode()).hexdigest()[:16]
+
+
+# Monta o mapa do folium e devolve o HTML com os marcadores no lugar das coordenadas.
+def build_template(tiles=MAP_TILES, zoom=MAP_ZOOM):
+    import folium
+    from branca.element import Element
+    from folium.plugins import Geocoder
+
+    m = folium.Map(tiles=tiles, attr=MAP_ATTRIBUTION, zoom_start=zoom, name='Esri Satellite', location=SENTINEL)
+    Geocoder().add_to(m)
+    root = m.get_root()
+    # A primeira renderização coloca o script do mapa em root.script; o JS da ponte vem depois dele.
+    root.render()
+    root.script.add_child(Element(BRIDGE_JS.replace('__MAP__', m.get_name())))
+    html = root.render()
+    for value, marker in zip(SENTINEL, (LAT_MARKER, LNG_MARKER)):
+        if html.count(repr(value)) != 1:
+            raise MapTemplateError(f"coordenada inicial não encontrada no HTML do folium: {value!r}")
+        html = html.replace(repr(value), marker)
+    return html
+
+
+@functools.lru_cache(maxsize=None)
+def load_template(tiles=MAP_TILES, zoom=MAP_ZOOM, cache_dir=CACHE_DIR):
+    path = os.path.join(cache_dir, f'map_template_{template_key(tiles, zoom)}.html')
+    try:
+        with open(path, encoding='utf-8') as f:
+            return f.read()
+    except FileNotFoundError:
+        pass
+    html = build_template(tiles, zoom)
+    os.makedirs(cache_dir, exist_ok=True)
+    # Escreve em arquivo temporário para que outro processo nunca leia um modelo pela metade.
+    temporary = f'{path}.{os.getpid()}.tmp'
+    with open(temporary, 'w', encoding='utf-8') as f:
+        f.write(html)
+    os.replace(temporary, path)
+    for stale in glob.glob(os.path.join(cache_dir, 'map_template_*.html')):
+        if stale != path:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+    return html
+
+
+# HTML do mapa centrado em `coordinate` (lat, lng).
+def render_map(coordinate, tiles=MAP_TILES, zoom=MAP_ZOOM):
+    lat, lng = coordinate
+    html = load_template(tiles, zoom)
+    return html.replace(LAT_MARKER, json.dumps(float(lat))).replace(LNG_MARKER, json.dumps(float(lng)))
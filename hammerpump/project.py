@@ -0,0 +1,138 @@
+# Arquivos de projeto (.hpump): um local de instalação salvo para ser reaberto sem rede.
+#
+# JSON compactado com gzip, com número de versão. Guarda as entradas do grafo da interface
+# (pontos, área, vazão, tubulações e materiais), os valores devolvidos pelas consultas à rede
+# (elevação de cada ponto e Q7,10) usados para produzir os resultados, os traçados das
+# tubulações e um resumo dos resultados (só para consulta e relatórios; ao abrir, eles são
+# recalculados a partir das entradas). Um projeto ocupa de 0,5 KB (sem traçados) a pouco mais
+# de 1 KB (traçados com dezenas de vértices).
+import gzip
+import json
+import math
+import os
+from typing import NamedTuple
+
+PROJECT_VERSION = 1
+PROJECT_SUFFIX = '.hpump'
+FORMAT = 'hammerpump-project'
+# Casas decimais dos vértices dos traçados (1e-7 grau ≈ 1 cm).
+VERTEX_DECIMALS = 7
+
+# Atualizações de arquivos de versões anteriores: versão → função que devolve o dicionário na
+# versão seguinte.
+MIGRATIONS = {}
+
+
+class ProjectError(Exception):
+    pass
+
+
+# inputs: entradas do grafo; lookups: resultados das consultas à rede, por nó; routes:
+# {nome: (vértices [(lat, lng)], elevações)}; results: resumo dos resultados calculados.
+class Project(NamedTuple):
+    inputs: dict
+    lookups: dict
+    routes: dict
+    results: dict
+    name: str = ''
+
+    # Ponto para centralizar o mapa: o primeiro definido entre fonte, bomba e reservatório.
+    def center(self):
+        for name in ('fonte', 'bomba', 'reservatorio'):
+            if self.inputs.get(name) is not None:
+                return self.inputs[name]
+        return None
+
+
+# JSON não tem NaN/infinito nem tuplas; floats NumPy viram float.
+def _plain(value):
+    if isinstance(value, dict):
+        return {str(k): _plain(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    if hasattr(value, 'tolist'):
+        return _plain(value.tolist())
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+# Listas de números voltam como tuplas (pontos), como estavam no grafo.
+def _tuples(value):
+    if isinstance(value, list) and all(isinstance(v, (int, float)) for v in value):
+        return tuple(value)
+    return value
+
+
+def to_dict(project: Project) -> dict:
+    return {
+        'format': FORMAT,
+        'version': PROJECT_VERSION,
+        'name': project.name,
+        'inputs': _plain(project.inputs),
+        'lookups': _plain(project.lookups),
+        'routes': {name: {'vertices': [[round(float(lat), VERTEX_DECIMALS), round(float(lng), VERTEX_DECIMALS)]
+                                       for lat, lng in vertices],
+                          'elevations': _plain(elevations)}
+                   for name, (vertices, elevations) in project.routes.items()},
+        'results': _plain(project.results),
+    }
+
+
+def from_dict(data: dict) -> Project:
+    if not isinstance(data, dict) or data.get('format') != FORMAT:
+        raise ProjectError("o arquivo não é um projeto do Hammer Pump")
+    version = data.get('version')
+    if not isinstance(version, int) or version > PROJECT_VERSION:
+        raise ProjectError(f"projeto na versão {version}, mais nova que a suportada ({PROJECT_VERSION})")
+    while version < PROJECT_VERSION:
+        if version not in MIGRATIONS:
+            raise ProjectError(f"não há como atualizar projetos da versão {version}")
+        data = MIGRATIONS[version](data)
+        version += 1
+    try:
+        routes = {name: ([tuple(p) for p in route['vertices']], list(route['elevations']))
+                  for name, route in data.get('routes', {}).items()}
+        return Project({name: _tuples(value) for name, value in data['inputs'].items()},
+                       {name: _tuples(value) for name, value in data.get('lookups', {}).items()},
+                       routes, data.get('results', {}), data.get('name', ''))
+    except (KeyError, TypeError, ValueError) as e:
+        raise ProjectError(f"projeto inválido: {e}") from e
+
+
+def dumps(project: Project) -> bytes:
+    text = json.dumps(to_dict(project), ensure_ascii=False, separators=(',', ':'))
+    # mtime=0: o mesmo projeto gera sempre os mesmos bytes.
+    return gzip.compress(text.encode('utf-8'), mtime=0)
+
+
+def loads(content: bytes) -> Project:
+    try:
+        if content[:2] == b'\x1f\x8b':
+            content = gzip.decompress(content)
+        data = json.loads(content.decode('utf-8'))
+    except (OSError, EOFError, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ProjectError(f"projeto ilegível: {e}") from e
+    return from_dict(data)
+
+
+def save_project(path: str, project: Project) -> None:
+    content = dumps(project)
+    # Escreve em arquivo temporário para nunca deixar um projeto pela metade (pen drive removido).
+    temporary = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(temporary, 'wb') as f:
+            f.write(content)
+        os.replace(temporary, path)
+    except BaseException:
+        # Disco cheio, destino sem permissão...: o temporário não fica para trás.
+        try:
+            os.remove(temporary)
+        except OSError:
+            pass
+        raise
+
+
+def load_project(path: str) -> Project:
+    with open(path, 'rb') as f:
+        return loads(f.read())
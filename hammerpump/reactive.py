@@ -0,0 +1,262 @@
+# Grafo de dependências dos resultados da interface (coordenadas → elevações → distâncias,
+# Q7,10 → vazão → modelo da bomba → perdas...).
+#
+# Cada nó guarda seu valor e as versões das entradas com que foi calculado; quando uma
+# entrada muda, só os nós que dependem dela (direta ou indiretamente) são recalculados, e um
+# nó cujo novo valor é igual ao anterior não propaga a mudança. Observadores de cada nó são
+# chamados quando o valor muda (na interface, para atualizar os campos).
+#
+# Um nó sem todas as entradas definidas vale None. Nós "em segundo plano" (rede, cálculos
+# pesados) são entregues a `submit` e valem None enquanto o resultado não chega, assim os nós
+# abaixo deles nunca misturam valores novos com antigos; um resultado que chega depois de as
+# entradas mudarem de novo é descartado. Nós em segundo plano do mesmo lote (batch()) que
+# ficam pendentes na mesma atualização são consultados juntos, em uma só tarefa.
+import itertools
+
+
+def _same(a, b):
+    if a is b:
+        return True
+    try:
+        return bool(a == b)
+    except (TypeError, ValueError):
+        # Arrays NumPy (ou tuplas com arrays) não têm igualdade como valor único.
+        return False
+
+
+class _Node:
+    __slots__ = ('name', 'fn', 'deps', 'background', 'batch', 'value', 'version', 'seen', 'pending', 'observers')
+
+    def __init__(self, name, fn=None, deps=(), background=False, value=None, batch=None):
+        self.name = name
+        self.fn = fn
+        self.deps = tuple(deps)
+        self.background = background
+        self.batch = batch
+        self.value = value
+        self.version = 0
+        self.seen = None
+        self.pending = None
+        self.observers = []
+
+
+# submit(chave, fn, args, on_result, on_error) executa fn(*args) fora da thread da interface e
+# chama on_result(valor) ou on_error(mensagem) de volta nela (ver workers.TaskRunner).
+# on_error(nome, mensagem) é chamado quando um nó falha; o nó passa a valer None.
+class Graph:
+    def __init__(self, submit=None, on_error=None):
+        self.submit = submit
+        self.on_error = on_error
+        self._nodes = {}
+        self._tokens = itertools.count(1)
+        self._waiters = []
+        self._dirty = False
+        self._refreshing = False
+        self._lookups = {}
+        self._restoring = ()
+        self._batches = {}
+        self._queued = {}
+
+    def input(self, name, value=None):
+        self._add(_Node(name, value=value))
+
+    # Lote de nós em segundo plano: fn(lista dos argumentos de cada nó) devolve a lista dos
+    # valores, na mesma ordem (por exemplo, as elevações de vários pontos em uma requisição).
+    def batch(self, key, fn):
+        self._batches[key] = fn
+
+    # Os nós de que este depende precisam ter sido criados antes, então a ordem de criação já
+    # é uma ordem topológica. Com `batch`, o nó é consultado pela função do lote, e `fn` não é
+    # chamada.
+    def node(self, name, fn, deps, background=False, batch=None):
+        missing = [dep for dep in deps if dep not in self._nodes]
+        if missing:
+            raise KeyError(f"dependências não definidas para '{name}': {', '.join(missing)}")
+        if background and self.submit is None:
+            raise ValueError(f"o nó '{name}' roda em segundo plano, mas o grafo não tem `submit`")
+        if batch is not None and (not background or batch not in self._batches):
+            raise ValueError(f"o nó '{name}' usa o lote '{batch}', que não foi definido com batch()")
+        self._add(_Node(name, fn, deps, background, batch=batch))
+        self._dirty = True
+        self.refresh()
+
+    def observe(self, name, callback):
+        self._nodes[name].observers.append(callback)
+
+    def get(self, name):
+        return self._nodes[name].value
+
+    def set(self, name, value):
+        node = self._nodes[name]
+        if node.fn is not None:
+            raise ValueError(f"'{name}' é calculado pelo grafo e não pode ser definido")
+        if name in self._restoring:
+            return
+        if self._update(node, value):
+            self._dirty = True
+            self.refresh()
+
+    # Entradas e valores dos nós em segundo plano (os resultados das consultas), para salvar.
+    def snapshot(self):
+        inputs = {name: node.value for name, node in self._nodes.items() if node.fn is None}
+        lookups = {name: node.value for name, node in self._nodes.items()
+                   if node.background and node.value is not None}
+        return inputs, lookups
+
+    # Troca todas as entradas de uma vez (as ausentes de `inputs` ficam sem valor). Os nós em
+    # segundo plano com valor em `lookups` recebem esse valor em vez de serem consultados;
+    # durante a restauração, observadores não alteram as entradas restauradas.
+    def restore(self, inputs, lookups=None):
+        self._lookups = dict(lookups or {})
+        self._restoring = frozenset(name for name, node in self._nodes.items() if node.fn is None)
+        try:
+            for node in self._nodes.values():
+                if node.fn is None:
+                    self._update(node, inputs.get(node.name))
+            self._dirty = True
+            self.refresh()
+        finally:
+            self._lookups = {}
+            self._restoring = ()
+
+    # Recalcula o nó mesmo sem mudança nas entradas (por exemplo, repetir uma consulta).
+    def invalidate(self, name):
+        self._nodes[name].seen = None
+        self._dirty = True
+        self.refresh()
+
+    # Sem nós em segundo plano pendentes entre `name` e as suas entradas.
+    def is_ready(self, name):
+        node = self._nodes[name]
+        if node.pending is not None:
+            return False
+        return all(self.is_ready(dep) for dep in node.deps)
+
+    # Chama `callback()` quando todos os `names` estiverem prontos (imediatamente, se já estão).
+    def when_ready(self, names, callback):
+        if callback is None:
+            return
+        if all(self.is_ready(name) for name in names):
+            callback()
+        else:
+            self._waiters.append((tuple(names), callback))
+
+    # Abandona os cálculos em segundo plano pendentes; os nós ficam sem valor até as suas
+    # entradas mudarem (ou invalidate()).
+    def cancel(self):
+        for node in self._nodes.values():
+            if node.pending is not None:
+                node.pending = None
+                node.seen = self._versions(node)
+        self._waiters.clear()
+
+    def refresh(self):
+        if self._refreshing:
+            return
+        self._refreshing = True
+        try:
+            while self._dirty:
+                self._dirty = False
+                for node in self._nodes.values():
+                    if node.fn is not None and node.seen != self._versions(node):
+                        self._compute(node)
+                self._submit_batches()
+        finally:
+            self._refreshing = False
+        self._notify_waiters()
+
+    def _add(self, node):
+        if node.name in self._nodes:
+            raise KeyError(f"nó '{node.name}' já definido")
+        self._nodes[node.name] = node
+
+    def _versions(self, node):
+        return tuple(self._nodes[dep].version for dep in node.deps)
+
+    def _compute(self, node):
+        node.seen = self._versions(node)
+        node.pending = None
+        args = [self._nodes[dep].value for dep in node.deps]
+        if any(arg is None for arg in args):
+            self._update(node, None)
+        elif node.background and node.name in self._lookups:
+            self._update(node, self._lookups.pop(node.name))
+        elif node.background:
+            token = node.pending = next(self._tokens)
+            self._update(node, None)
+            if node.batch is not None:
+                self._queued.setdefault(node.batch, []).append((node, token, args))
+                return
+            self.submit(node.name, node.fn, args,
+                        lambda value: self._finished(node, token, value),
+                        lambda message: self._failed(node, token, message))
+        else:
+            try:
+                value = node.fn(*args)
+            except Exception as e:
+                self._update(node, None)
+                self._report(node, str(e))
+            else:
+                self._update(node, value)
+
+    # Uma tarefa por lote; o nome (os nós do lote) distingue lotes diferentes em `submit`.
+    def _submit_batches(self):
+        queued, self._queued = self._queued, {}
+        for key, items in queued.items():
+            nodes = [(node, token) for node, token, _ in items]
+            self.submit('+'.join(node.name for node, _ in nodes), self._batches[key], [[args for _, _, args in items]],
+                        lambda values, nodes=nodes: self._batch_finished(nodes, values),
+                        lambda message, nodes=nodes: self._batch_failed(nodes, message))
+
+    def _batch_finished(self, nodes, values):
+        for (node, token), value in zip(nodes, values):
+            if node.pending == token:
+                node.pending = None
+                if self._update(node, value):
+                    self._dirty = True
+        self.refresh()
+
+    def _batch_failed(self, nodes, message):
+        for node, token in nodes:
+            if node.pending == token:
+                node.pending = None
+                self._report(node, message)
+        self.refresh()
+
+    def _finished(self, node, token, value):
+        if node.pending != token:
+            return
+        node.pending = None
+        if self._update(node, value):
+            self._dirty = True
+        self.refresh()
+
+    def _failed(self, node, token, message):
+        if node.pending != token:
+            return
+        node.pending = None
+        self._report(node, message)
+        self.refresh()
+
+    def _report(self, node, message):
+        if self.on_error is not None:
+            self.on_error(node.name, message)
+
+    # Devolve True se o valor mudou.
+    def _update(self, node, value):
+        if _same(node.value, value):
+            return False
+        node.value = value
+        node.version += 1
+        self._dirty = True
+        for callback in node.observers:
+            callback(value)
+        return True
+
+    def _notify_waiters(self):
+        waiters, self._waiters = self._waiters, []
+        for names, callback in waiters:
+            if all(self.is_ready(name) for name in names):
+                callback()
+            else:
+                self._waiters.append((names, callback))
@@ -0,0 +1,528 @@
+# Relatórios dos locais de instalação: um HTML autocontido por projeto (.hpump), com o mapa
+# do local, os perfis do terreno ao longo das tubulações, o modelo da bomba, as perdas de
+# carga e os avisos que a Tela mostraria. O PDF sai do mesmo HTML (com o pacote opcional
+# weasyprint; na interface, pelo QtWebEngine).
+#
+#   python -m hammerpump.report projetos/*.hpump -o relatorios --workers 8 [--pdf]
+#
+# Os resultados são recalculados a partir das entradas e das consultas salvas no projeto, sem
+# rede. O mapa é um SVG com os tiles do cache MBTiles embutidos como imagens, sem decodificá-
+# los; tiles fora do cache ficam em cinza (baixe a região antes ou use --download-tiles). Os
+# perfis usam as cotas dos pontos e dos vértices salvas no projeto, ou, com --sample-profiles,
+# amostras da fonte de elevações (DEM local ou API).
+#
+# Em lote, os projetos são distribuídos em um ProcessPoolExecutor com um número limitado de
+# tarefas em andamento; cada processo lê o modelo HTML e abre o cache de tiles uma única vez,
+# e cada relatório é gravado assim que fica pronto. Um index.html lista todos os locais.
+import argparse
+import base64
+import datetime
+import functools
+import html
+import math
+import multiprocessing
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from string import Template
+from typing import NamedTuple
+
+import numpy as np
+
+from .charts import line_chart
+from .core import MAX_DISTANCE, MAX_HEIGHT, Profile, Route, default_catalog
+from .core.terrain_profile import hydraulic_grade_line, route_distances
+from .installation import POINTS, ROUTE_ENDS, calcular_perfis, comprimentos_retos, define_nodes
+from .map_template import MAP_ATTRIBUTION
+from .project import load_project
+from .reactive import Graph
+from .settings import REPORT_MAX_ZOOM, REPORT_WORKERS
+from .tile_cache import TILE_SIZE, TileCache, TileError, content_type, pixel_xy
+
+TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'report.html')
+
+MAP_WIDTH = 640
+MAP_HEIGHT = 400
+# Margem (px) entre os pontos mais externos e a borda do mapa.
+MAP_PADDING = 40
+
+POINT_LABELS = {'fonte': "Fonte", 'bomba': "Bomba", 'reservatorio': "Reservatório"}
+POINT_COLORS = {'fonte': '#1f77b4', 'bomba': '#d62728', 'reservatorio': '#2ca02c'}
+PIPE_LABELS = {'entrada': "Alimentação", 'saida': "Recalque"}
+
+INDEX_TEMPLATE = Template("""<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="utf-8">
+<title>Relatórios</title>
+<style>
+body { font-family: sans-serif; font-size: 10.5pt; }
+table { border-collapse: collapse; }
+th, td { text-align: left; padding: 2pt 8pt; border-bottom: 1px solid #eee; }
+</style>
+</head>
+<body>
+<h1>Relatórios ($count locais)</h1>
+$table
+</body>
+</html>
+""")
+
+# Em cada processo da geração em lote (ver init_worker).
+_tiles = None
+_download = False
+_elevation_source = None
+
+
+class ReportError(Exception):
+    pass
+
+
+# Tubulação: diâmetro (pol.) e material, comprimento (m) e perda de carga (m); `segments` é o
+# número de segmentos do traçado (0 sem traçado: reta entre as pontas).
+class Pipe(NamedTuple):
+    tubo: str
+    material: str
+    length: float
+    loss: float
+    segments: int
+
+
+# Resultados de um local, recalculados a partir do projeto. points: nome → (lat, lng, cota) dos
+# pontos definidos; errors: resultados que o projeto não permite calcular.
+class Evaluation(NamedTuple):
+    points: dict
+    geometria: object
+    vazao: object
+    modelo: object
+    pipes: dict
+    routes: dict
+    errors: list
+
+
+class Report(NamedTuple):
+    html: str
+    evaluation: Evaluation
+    warnings: list
+
+
+# O modelo é lido e compilado uma única vez por processo.
+@functools.lru_cache(maxsize=None)
+def load_template(path=TEMPLATE_PATH):
+    with open(path, encoding='utf-8') as f:
+        return Template(f.read())
+
+
+def _not_saved(*args):
+    raise ReportError("consulta à rede ao gerar o relatório")
+
+
+# Consultas que faltam no projeto não são feitas: o nó fica sem valor.
+def _offline(name, fn, args, on_result, on_error):
+    on_error("não está salvo no projeto")
+
+
+def evaluate_project(project):
+    errors = []
+    graph = define_nodes(Graph(submit=_offline, on_error=lambda name, message: errors.append(f"{name}: {message}")),
+                         _not_saved, _not_saved)
+    graph.restore(project.inputs, project.lookups)
+    points = {}
+    for name in POINTS:
+        point = graph.get(name)
+        if point is not None:
+            points[name] = (float(point[0]), float(point[1]), graph.get(f'elevacao_{name}'))
+    geometria = graph.get('geometria')
+    perdas = graph.get('perdas')
+    routes = {}
+    pipes = {}
+    for n, name in enumerate(ROUTE_ENDS):
+        parameters = graph.get(f'parametros_{name}')
+        if parameters is None:
+            continue
+        vertices, elevations = project.routes.get(name, ((), ()))
+        tubo, material = graph.get(f'tubo_{name}'), graph.get(f'material_{name}')
+        if len(vertices) >= 2:
+            route = routes[name] = Route(vertices, elevations, *parameters)
+            pipes[name] = Pipe(tubo, material, route.total_length, route.total_loss, len(route) - 1)
+        elif perdas is not None:
+            pipes[name] = Pipe(tubo, material, comprimentos_retos(geometria)[name], perdas[n], 0)
+    return Evaluation(points, geometria, graph.get('vazao'), graph.get('modelo'), pipes, routes, errors)
+
+
+# Perfil só com as cotas conhecidas (pontas e vértices do traçado), sem consultas.
+def vertex_profile(vertices, elevations, start_head, end_head):
+    vertices = np.asarray(vertices, dtype=np.float64)
+    elevation = np.asarray(elevations, dtype=np.float64)
+    distance = route_distances(vertices[:, 0], vertices[:, 1])
+    hgl = hydraulic_grade_line(distance, start_head, end_head)
+    return Profile(vertices[:, 0], vertices[:, 1], distance, elevation, hgl, elevation > hgl)
+
+
+# Vértices (lat, lng) e cotas de cada tubulação: o traçado salvo ou a reta entre os pontos.
+def pipe_lines(evaluation):
+    points = evaluation.points
+    lines = {}
+    for name, (start, end) in ROUTE_ENDS.items():
+        route = evaluation.routes.get(name)
+        if route is not None:
+            lines[name] = (route.vertices, route.elevations.tolist())
+        elif start in points and end in points:
+            lines[name] = ([points[start][:2], points[end][:2]], [points[start][2], points[end][2]])
+    return lines
+
+
+# Perfis da alimentação e do recalque (mesmas cargas da Tela); com `source`, amostrados na
+# fonte de elevações, e pelas cotas dos vértices se a consulta falhar (aviso em `notes`).
+def site_profiles(evaluation, source=None, notes=None):
+    lines = pipe_lines(evaluation)
+    if len(lines) < 2 or len(evaluation.points) < len(POINTS) or \
+            any(z is None for _, _, z in evaluation.points.values()):
+        return {}
+    zf, zb, zr = (evaluation.points[name][2] for name in POINTS)
+    if source is not None:
+        try:
+            entrada, saida = calcular_perfis(source, lines['entrada'][0], lines['saida'][0], zf, zb, zr)
+            return {'entrada': entrada, 'saida': saida}
+        except Exception as e:
+            if notes is not None:
+                notes.append(f"Perfis só pelas cotas dos vértices (falha na consulta de elevações: {e}).")
+    return {'entrada': vertex_profile(*lines['entrada'], zf, zb), 'saida': vertex_profile(*lines['saida'], zr, zr)}
+
+
+# Os mesmos avisos da Tela, mais os resultados que não puderam ser calculados.
+def installation_warnings(evaluation, profiles):
+    warnings = []
+    geometria = evaluation.geometria
+    if geometria is not None:
+        if geometria.altura_fr > 0:
+            warnings.append("Você não precisa de uma bomba, a gravidade está a seu favor.")
+        if geometria.altura_br > MAX_HEIGHT:
+            warnings.append(f"A diferença de altura entre a bomba e seu reservatório é maior que {MAX_HEIGHT} "
+                            f"metros, você excedeu os limites do fabricante.")
+        if geometria.distancia_br > MAX_DISTANCE:
+            warnings.append(f"A distância entre a bomba e o reservatório é maior que {MAX_DISTANCE} metros, "
+                            f"você excedeu os limites do fabricante.")
+    if evaluation.vazao is not None and evaluation.modelo is None:
+        warnings.append("A vazão é insuficiente para uma instalação de bombas carneiro, considere outra tecnologia.")
+    for name, profile in profiles.items():
+        if profile.above_hgl.any():
+            highest = profile.distance[profile.above_hgl][(profile.elevation - profile.hgl)[profile.above_hgl].argmax()]
+            warnings.append(f"O terreno ao longo da tubulação de {PIPE_LABELS[name].lower()} sobe acima da linha "
+                            f"piezométrica (ponto mais crítico a {highest:.0f} m do início), verifique o traçado.")
+    warnings.extend(f"Não calculado: {error}." for error in evaluation.errors)
+    return warnings
+
+
+# Maior zoom (até `max_zoom`) em que todas as coordenadas cabem em width × height px.
+def fit_zoom(coordinates, width, height, max_zoom=REPORT_MAX_ZOOM):
+    xs, ys = zip(*(pixel_xy(lat, lng, 0) for lat, lng in coordinates))
+    span = max((max(xs) - min(xs)) / max(width, 1), (max(ys) - min(ys)) / max(height, 1))
+    if span <= 0:
+        return max_zoom
+    return min(max(int(math.floor(math.log2(1 / span))), 0), max_zoom)
+
+
+def _tile(tiles, z, x, y, download):
+    if tiles is None:
+        return None
+    if not download:
+        return tiles.get(z, x, y)
+    try:
+        return tiles.fetch(z, x, y)
+    except TileError:
+        return None
+
+
+# Mapa do local em SVG: tiles do cache (imagens embutidas), tubulações e pontos. points: nome →
+# (lat, lng, ...); lines: nome → (vértices, cotas). Com `download`, tiles fora do cache são
+# baixados e gravados nele.
+def map_snapshot(points, lines, tiles=None, download=False, width=MAP_WIDTH, height=MAP_HEIGHT,
+                 max_zoom=REPORT_MAX_ZOOM):
+    coordinates = [point[:2] for point in points.values()]
+    coordinates += [vertex for vertices, _ in lines.values() for vertex in vertices]
+    if not coordinates:
+        return ''
+    zoom = fit_zoom(coordinates, width - 2 * MAP_PADDING, height - 2 * MAP_PADDING, max_zoom)
+    xs, ys = zip(*(pixel_xy(lat, lng, zoom) for lat, lng in coordinates))
+    left = (min(xs) + max(xs) - width) / 2
+    top = (min(ys) + max(ys) - height) / 2
+
+    def xy(lat, lng):
+        x, y = pixel_xy(lat, lng, zoom)
+        return f"{x - left:.1f},{y - top:.1f}"
+
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+             f'viewBox="0 0 {width} {height}" font-family="sans-serif" font-size="12">',
+             f'<rect width="{width}" height="{height}" fill="#d9d9d9"/>']
+    n = 1 << zoom
+    drawn = 0
+    for ty in range(max(int(top // TILE_SIZE), 0), min(int((top + height) // TILE_SIZE), n - 1) + 1):
+        for tx in range(int(left // TILE_SIZE), int((left + width) // TILE_SIZE) + 1):
+            data = _tile(tiles, zoom, tx % n, ty, download)
+            if data is None:
+                continue
+            drawn += 1
+            parts.append(f'<image x="{tx * TILE_SIZE - left:.1f}" y="{ty * TILE_SIZE - top:.1f}" '
+                         f'width="{TILE_SIZE}" height="{TILE_SIZE}" preserveAspectRatio="none" '
+                         f'href="data:{content_type(data)};base64,{base64.b64encode(data).decode("ascii")}"/>')
+    for vertices, _ in lines.values():
+        path = ' '.join(xy(lat, lng) for lat, lng in vertices)
+        parts.append(f'<polyline points="{path}" fill="none" stroke="white" stroke-width="6"/>')
+        parts.append(f'<polyline points="{path}" fill="none" stroke="#1f77b4" stroke-width="3"/>')
+    for name, point in points.items():
+        x, y = xy(*point[:2]).split(',')
+        parts.append(f'<circle cx="{x}" cy="{y}" r="7" fill="{POINT_COLORS.get(name, "#555")}" '
+                     f'stroke="white" stroke-width="2"/>')
+        parts.append(f'<text x="{float(x) + 10:.1f}" y="{float(y) + 4:.1f}" stroke="white" stroke-width="3" '
+                     f'paint-order="stroke">{html.escape(POINT_LABELS.get(name, name))}</text>')
+    if drawn:
+        parts.append(f'<text x="{width - 4}" y="{height - 4}" text-anchor="end" font-size="9" fill="white">'
+                     f'{html.escape(MAP_ATTRIBUTION)}</text>')
+    parts.append('</svg>')
+    return '\n'.join(parts)
+
+
+def _number(value, digits=2):
+    if value is None or (isinstance(value, float) and not math.isfinite(value)):
+        return "—"
+    return f"{value:.{digits}f}"
+
+
+# rows: sequências de células já formatadas; as colunas em `numeric` ficam alinhadas à direita.
+def _table(header, rows, numeric=()):
+    lines = ['<table>']
+    if header:
+        lines.append('<tr>' + ''.join(f'<th>{html.escape(h)}</th>' for h in header) + '</tr>')
+    for row in rows:
+        cells = (f'<td class="number">{html.escape(str(cell))}</td>' if n in numeric
+                 else f'<td>{html.escape(str(cell))}</td>' for n, cell in enumerate(row))
+        lines.append('<tr>' + ''.join(cells) + '</tr>')
+    lines.append('</table>')
+    return '\n'.join(lines)
+
+
+def _points_section(evaluation):
+    rows = [(POINT_LABELS[name], f"{lat:.6f}", f"{lng:.6f}", _number(z, 1))
+            for name, (lat, lng, z) in evaluation.points.items()]
+    section = _table(("Ponto", "Latitude", "Longitude", "Cota (m)"), rows, numeric=(1, 2, 3))
+    geometria = evaluation.geometria
+    if geometria is not None:
+        section += '\n' + _table(("Entre", "Desnível (m)", "Distância (m)"), [
+            ("Fonte e reservatório", _number(geometria.altura_fr), _number(geometria.distancia_fr)),
+            ("Fonte e bomba", _number(geometria.altura_fb), _number(geometria.distancia_fb)),
+            ("Reservatório e bomba", _number(geometria.altura_br), _number(geometria.distancia_br)),
+        ], numeric=(1, 2))
+    return section
+
+
+# Faixa de vazão de alimentação de um modelo; o último do catálogo não tem limite superior.
+def _flow_range(low, high):
+    return f"{low:g} a {high:g}" if math.isfinite(high) else f"a partir de {low:g}"
+
+
+def _pump_section(evaluation):
+    pump = evaluation.modelo
+    rows = [("Vazão (L/min)", _number(evaluation.vazao))]
+    if pump is not None:
+        rows += [("Modelo", f"{pump.manufacturer} {pump.model}"),
+                 ("Vazão de alimentação do modelo (L/min)", _flow_range(pump.drive_flow_min, pump.drive_flow_max)),
+                 ("Vazão elevada do modelo (L/h)", f"{pump.flow_min:g} a {pump.flow_max:g}"),
+                 ("Tubulações do modelo (pol.)", f"{pump.pipe_in} / {pump.pipe_out}")]
+        alternatives = [f"{m.manufacturer} {m.model}" for m in default_catalog().feasible(evaluation.vazao)[1:]]
+        if alternatives:
+            rows.append(("Alternativas", ", ".join(alternatives)))
+    else:
+        rows.append(("Modelo", "Nenhum"))
+    return _table(None, rows)
+
+
+def _pipes_section(evaluation):
+    rows = [(PIPE_LABELS[name], pipe.tubo, pipe.material, _number(pipe.length, 1), _number(pipe.loss, 3),
+             pipe.segments or "reta")
+            for name, pipe in evaluation.pipes.items()]
+    if not rows:
+        return '<p>Vazão, diâmetros ou materiais não definidos.</p>'
+    return _table(("Tubulação", "Diâmetro (pol.)", "Material", "Comprimento (m)", "Perda de carga (m)",
+                   "Segmentos"), rows, numeric=(3, 4, 5))
+
+
+def _profiles_section(profiles):
+    if not profiles:
+        return '<p>Pontos ou elevações não definidos.</p>'
+    return '\n'.join(
+        '<figure>' + line_chart(profile.distance, [("Terreno", profile.elevation), ("Linha piezométrica", profile.hgl)],
+                                "Distância (m)", "Cota (m)", f"Tubulação de {PIPE_LABELS[name].lower()}",
+                                height=280, y_zero=False) + '</figure>'
+        for name, profile in profiles.items())
+
+
+def _warnings_section(warnings):
+    if not warnings:
+        return '<p class="ok">Nenhum aviso.</p>'
+    return '<ul class="warnings">\n' + '\n'.join(f'<li>{html.escape(w)}</li>' for w in warnings) + '\n</ul>'
+
+
+# Relatório de um projeto. tiles: hammerpump.tile_cache.TileCache (sem ele, o mapa fica só
+# com os pontos e as tubulações); source: fonte de elevações para amostrar os perfis.
+def build_report(project, tiles=None, download=False, source=None, title=None):
+    evaluation = evaluate_project(project)
+    notes = []
+    profiles = site_profiles(evaluation, source, notes)
+    warnings = installation_warnings(evaluation, profiles) + notes
+    title = title or project.name or "Local de instalação"
+    content = load_template().substitute(
+        title=html.escape(title),
+        subtitle=f"Relatório gerado em {datetime.date.today():%d/%m/%Y}",
+        map=map_snapshot(evaluation.points, pipe_lines(evaluation), tiles, download),
+        points=_points_section(evaluation),
+        pump=_pump_section(evaluation),
+        pipes=_pipes_section(evaluation),
+        profiles=_profiles_section(profiles),
+        warnings=_warnings_section(warnings),
+    )
+    return Report(content, evaluation, warnings)
+
+
+# weasyprint é opcional e só é importado aqui.
+def write_pdf(content, path):
+    try:
+        from weasyprint import HTML
+    except ImportError as e:
+        raise ReportError("a geração de PDF requer o pacote weasyprint") from e
+    HTML(string=content).write_pdf(path)
+
+
+def write_text(path, content):
+    # Escreve em arquivo temporário para nunca deixar um relatório pela metade.
+    temporary = f'{path}.{os.getpid()}.tmp'
+    with open(temporary, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(temporary, path)
+
+
+# Executado uma vez em cada processo: modelo compilado, conexão própria com o cache de tiles e,
+# com `sample_profiles`, fonte de elevações própria.
+def init_worker(tile_path=None, download=False, sample_profiles=False):
+    global _tiles, _download, _elevation_source
+    load_template()
+    _tiles = TileCache(tile_path) if tile_path != '' else None
+    _download = download
+    if sample_profiles:
+        from .elevation import default_elevation_source
+        _elevation_source = default_elevation_source()
+
+
+# Gera o relatório de um projeto em `output` (.html; com `pdf`, também o .pdf ao lado) e devolve
+# a linha do índice.
+def report_file(path, output, pdf=False):
+    row = {'project': path, 'output': output, 'name': '', 'model': '', 'warnings': 0, 'error': ''}
+    try:
+        project = load_project(path)
+        row['name'] = project.name or os.path.splitext(os.path.basename(path))[0]
+        report = build_report(project, _tiles, _download, _elevation_source, title=row['name'])
+        write_text(output, report.html)
+        if pdf:
+            write_pdf(report.html, os.path.splitext(output)[0] + '.pdf')
+        pump = report.evaluation.modelo
+        row['model'] = f"{pump.manufacturer} {pump.model}" if pump is not None else ''
+        row['warnings'] = len(report.warnings)
+    except Exception as e:
+        row['error'] = f"{type(e).__name__}: {e}"
+    return row
+
+
+# Nome do relatório de cada projeto em `output_dir`, sem repetições.
+def output_paths(paths, output_dir):
+    used = set()
+    for path in paths:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        name, n = stem, 1
+        while name in used:
+            n += 1
+            name = f"{stem}_{n}"
+        used.add(name)
+        yield path, os.path.join(output_dir, name + '.html')
+
+
+# Gera as linhas do índice na ordem em que os relatórios ficam prontos, com no máximo
+# `window` projetos em andamento.
+def generate_reports(paths, output_dir, pdf=False, workers=None, window=None, tile_path=None, download=False,
+                     sample_profiles=False):
+    workers = workers or REPORT_WORKERS or os.cpu_count() or 1
+    window = window or workers * 4
+    os.makedirs(output_dir, exist_ok=True)
+    # spawn: a geração em lote também é iniciada de uma thread da interface.
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                             initializer=init_worker, initargs=(tile_path, download, sample_profiles)) as executor:
+        pending = set()
+        for path, output in output_paths(paths, output_dir):
+            pending.add(executor.submit(report_file, path, output, pdf))
+            if len(pending) >= window:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        for future in pending:
+            yield future.result()
+
+
+def write_index(output_dir, rows):
+    rows = sorted(rows, key=lambda row: row['output'])
+    lines = ['<table>', '<tr><th>Local</th><th>Projeto</th><th>Modelo</th><th>Avisos</th><th>Erro</th></tr>']
+    for row in rows:
+        name = html.escape(row['name'])
+        link = name if row['error'] else f'<a href="{html.escape(os.path.basename(row["output"]))}">{name}</a>'
+        lines.append(f"<tr><td>{link}</td><td>{html.escape(os.path.basename(row['project']))}</td>"
+                     f"<td>{html.escape(row['model'])}</td><td>{row['warnings']}</td>"
+                     f"<td>{html.escape(row['error'])}</td></tr>")
+    lines.append('</table>')
+    path = os.path.join(output_dir, 'index.html')
+    write_text(path, INDEX_TEMPLATE.substitute(count=len(rows), table='\n'.join(lines)))
+    return path
+
+
+# Lote completo: relatórios e índice. `progress` (0–100) e `is_cancelled` seguem a convenção
+# de workers.Worker(with_progress=True); devolve (gerados, falhas).
+def write_reports(paths, output_dir, pdf=False, workers=None, progress=None, is_cancelled=None, **options):
+    paths = list(paths)
+    rows = []
+    for row in generate_reports(paths, output_dir, pdf, workers, **options):
+        rows.append(row)
+        if progress is not None:
+            progress(int(100 * len(rows) / len(paths)))
+        if is_cancelled is not None and is_cancelled():
+            break
+    write_index(output_dir, rows)
+    failed = sum(1 for row in rows if row['error'])
+    return len(rows) - failed, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Relatórios dos locais de instalação salvos em projetos (.hpump).")
+    parser.add_argument('projects', nargs='+', help="arquivos de projeto")
+    parser.add_argument('-o', '--output', default='relatorios', help="diretório dos relatórios")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="número de processos")
+    parser.add_argument('--pdf', action='store_true', help="gera também o PDF de cada relatório (weasyprint)")
+    parser.add_argument('--tiles', default=None, help="arquivo MBTiles do cache de tiles ('' para mapas sem imagem)")
+    parser.add_argument('--download-tiles', action='store_true', help="baixa os tiles que faltam no cache")
+    parser.add_argument('--sample-profiles', action='store_true',
+                        help="amostra os perfis na fonte de elevações em vez de usar só as cotas salvas")
+    args = parser.parse_args(argv)
+    if args.pdf:
+        try:
+            import weasyprint  # noqa: F401
+        except ImportError:
+            parser.error("--pdf requer o pacote weasyprint")
+    rows = []
+    for row in generate_reports(args.projects, args.output, args.pdf, args.workers, tile_path=args.tiles,
+                                download=args.download_tiles, sample_profiles=args.sample_profiles):
+        rows.append(row)
+        if row['error']:
+            print(f"{row['project']}: {row['error']}", file=sys.stderr)
+    index = write_index(args.output, rows)
+    failed = sum(1 for row in rows if row['error'])
+    print(f"{len(rows) - failed} relatórios gerados, {failed} com erro: {index}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
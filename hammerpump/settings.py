@@ -0,0 +1,47 @@
+# Configurações compartilhadas pela interface e pelos módulos de cálculo.
+# Todos os valores podem ser sobrescritos por variáveis de ambiente.
+import os
+
+# Chave da Google Elevation API (defina GOOGLE_API_KEY no ambiente).
+API_KEY = os.environ.get('GOOGLE_API_KEY', 'INSERT YOUR KEY')
+BASE_URL = 'https://maps.googleapis.com/maps/api/elevation/json'
+
+# Tempo máximo (s) de espera por uma resposta HTTP.
+REQUEST_TIMEOUT = float(os.environ.get('HAMMERPUMP_TIMEOUT', '15'))
+
+# Diretório dos caches persistentes (elevações, vazões, mapas).
+CACHE_DIR = os.environ.get('HAMMERPUMP_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.hammerpump'))
+
+# Cache de elevações: casas decimais usadas na chave (5 ≈ 1,1 m), limite de entradas e validade (s).
+ELEVATION_CACHE_PRECISION = int(os.environ.get('HAMMERPUMP_ELEVATION_PRECISION', '5'))
+ELEVATION_CACHE_MAX_ENTRIES = int(os.environ.get('HAMMERPUMP_ELEVATION_MAX_ENTRIES', '200000'))
+ELEVATION_CACHE_TTL = float(os.environ.get('HAMMERPUMP_ELEVATION_TTL', str(365 * 24 * 3600)))
+
+# Diretório com tiles SRTM/Copernicus locais; quando definido, as elevações são lidas
+# offline e a Elevation API só é usada para pontos fora dos tiles.
+DEM_DIR = os.environ.get('HAMMERPUMP_DEM_DIR', '')
+
+# Mapa de Regionalização de Vazões (LEB/ESALQ).
+REGIONALIZATION_URL = 'http://www.leb.esalq.usp.br/wolff/rv/resultado.php'
+
+# Base pré-calculada de regionalização (JSON) para estimar vazões sem acesso ao site.
+REGIONALIZATION_DATASET = os.environ.get('HAMMERPUMP_REGIONALIZATION_DATASET', '')
+
+# Tiles de imagem de satélite: servidor de origem, arquivo MBTiles do cache local (padrão:
+# CACHE_DIR/tiles.mbtiles) e número de downloads simultâneos ao baixar uma região.
+TILE_URL = os.environ.get(
+    'HAMMERPUMP_TILE_URL', 'https://server.arcgisonline.com/ArcGIS/rest/services/World_Imagery/MapServer/tile/{z}/{y}/{x}')
+TILE_CACHE = os.environ.get('HAMMERPUMP_TILE_CACHE', '')
+TILE_PREFETCH_WORKERS = int(os.environ.get('HAMMERPUMP_TILE_WORKERS', '8'))
+
+# Análise de incerteza (Monte Carlo): número de amostras e de processos (0 = um por CPU).
+UNCERTAINTY_SAMPLES = int(os.environ.get('HAMMERPUMP_MC_SAMPLES', '500000'))
+UNCERTAINTY_WORKERS = int(os.environ.get('HAMMERPUMP_MC_WORKERS', '0'))
+
+# Fator de atrito pela tabela pré-calculada (core.friction_table) em vez do solver exato na
+# otimização das tubulações, na análise de incerteza e nos traçados (1 = ligado).
+FRICTION_TABLE = os.environ.get('HAMMERPUMP_FRICTION_TABLE', '0') not in ('', '0')
+
+# Relatórios: número de processos da geração em lote (0 = um por CPU) e zoom máximo do mapa.
+REPORT_WORKERS = int(os.environ.get('HAMMERPUMP_REPORT_WORKERS', '0'))
+REPORT_MAX_ZOOM = int(os.environ.get('HAMMERPUMP_REPORT_MAX_ZOOM', '18'))
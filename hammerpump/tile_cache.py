@@ -0,0 +1,235 @@
+# Cache local de tiles de imagem de satélite em um arquivo MBTiles (SQLite).
+#
+# fetch() lê do cache e, na falta do tile, baixa do servidor de origem e grava (read-through);
+# sem rede, só o que já está no cache é servido. prefetch() baixa antecipadamente todos os
+# tiles de uma região em um intervalo de zooms, com um número limitado de downloads em
+# paralelo, para uso em campo sem conexão.
+#
+# O arquivo segue a especificação MBTiles 1.3: tabelas `metadata` e `tiles`, com as linhas
+# no esquema TMS (y invertido em relação ao esquema XYZ usado pelo Leaflet).
+import math
+import os
+import sqlite3
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .settings import CACHE_DIR, REQUEST_TIMEOUT, TILE_CACHE, TILE_PREFETCH_WORKERS, TILE_URL
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS metadata (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS tiles (
+    zoom_level INTEGER NOT NULL,
+    tile_column INTEGER NOT NULL,
+    tile_row INTEGER NOT NULL,
+    tile_data BLOB NOT NULL,
+    PRIMARY KEY (zoom_level, tile_column, tile_row)
+) WITHOUT ROWID;
+"""
+
+# Latitude máxima da projeção Web Mercator.
+MAX_LATITUDE = 85.0511287798
+# Lado dos tiles (px).
+TILE_SIZE = 256
+
+
+class TileError(Exception):
+    pass
+
+
+# Posição do ponto em pixels no mapa inteiro no zoom `z` (o tile XYZ (x, y) ocupa
+# [256x, 256(x + 1)) × [256y, 256(y + 1))).
+def pixel_xy(lat, lng, z):
+    size = TILE_SIZE << z
+    lat = math.radians(min(max(lat, -MAX_LATITUDE), MAX_LATITUDE))
+    return ((lng + 180.0) / 360.0 * size,
+            (1.0 - math.log(math.tan(lat) + 1.0 / math.cos(lat)) / math.pi) / 2.0 * size)
+
+
+# Tile XYZ que contém o ponto no zoom `z`.
+def tile_xy(lat, lng, z):
+    n = 1 << z
+    lat = math.radians(min(max(lat, -MAX_LATITUDE), MAX_LATITUDE))
+    x = int((lng + 180.0) / 360.0 * n)
+    y = int((1.0 - math.log(math.tan(lat) + 1.0 / math.cos(lat)) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+# Tiles (z, x, y) que cobrem a região (sul, oeste, norte, leste) em cada zoom de `zooms`.
+def tiles_in_bounds(bounds, zooms):
+    south, west, north, east = bounds
+    for z in zooms:
+        x0, y0 = tile_xy(north, west, z)
+        x1, y1 = tile_xy(south, east, z)
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                yield z, x, y
+
+
+def count_tiles(bounds, zooms):
+    south, west, north, east = bounds
+    total = 0
+    for z in zooms:
+        x0, y0 = tile_xy(north, west, z)
+        x1, y1 = tile_xy(south, east, z)
+        total += (x1 - x0 + 1) * (y1 - y0 + 1)
+    return total
+
+
+def content_type(data):
+    if data[:8] == b'\x89PNG\r\n\x1a\n':
+        return 'image/png'
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return 'image/webp'
+    return 'image/jpeg'
+
+
+class TileCache:
+    def __init__(self, path=None, url=TILE_URL, timeout=REQUEST_TIMEOUT, session=None):
+        if not path:
+            path = TILE_CACHE or os.path.join(CACHE_DIR, 'tiles.mbtiles')
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self.url = url
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self._session = session
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(SCHEMA)
+        self._conn.executemany('INSERT OR IGNORE INTO metadata (name, value) VALUES (?, ?)',
+                               [('name', 'hammerpump'), ('format', 'jpg'), ('type', 'baselayer'),
+                                ('version', '1.3'), ('description', url)])
+        self._conn.commit()
+
+    # requests só é importado no primeiro download; os downloads em paralelo compartilham a sessão.
+    @property
+    def session(self):
+        with self._lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(TILE_PREFETCH_WORKERS, 4), max_retries=1)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                self._session = session
+            return self._session
+
+    @staticmethod
+    def key(z, x, y):
+        return z, x, (1 << z) - 1 - y
+
+    def get(self, z, x, y):
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT tile_data FROM tiles WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?',
+                self.key(z, x, y)).fetchone()
+        return None if row is None else bytes(row[0])
+
+    # `items` é uma sequência de (z, x, y, dados).
+    def put_many(self, items):
+        rows = [(*self.key(z, x, y), sqlite3.Binary(data)) for z, x, y, data in items]
+        with self._lock:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO tiles (zoom_level, tile_column, tile_row, tile_data) VALUES (?, ?, ?, ?)',
+                rows)
+            self._conn.commit()
+
+    def put(self, z, x, y, data):
+        self.put_many([(z, x, y, data)])
+
+    # Tiles de `tiles` que ainda não estão no cache.
+    def missing(self, tiles):
+        with self._lock:
+            return [tile for tile in tiles if self._conn.execute(
+                'SELECT 1 FROM tiles WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?',
+                self.key(*tile)).fetchone() is None]
+
+    def download(self, z, x, y):
+        import requests
+
+        try:
+            response = self.session.get(self.url.format(z=z, x=x, y=y), timeout=self.timeout)
+        except requests.RequestException as e:
+            raise TileError(f"falha ao baixar o tile {z}/{x}/{y}: {e}") from e
+        if response.status_code != 200 or not response.content:
+            raise TileError(f"tile {z}/{x}/{y} indisponível (HTTP {response.status_code})")
+        return response.content
+
+    # Tile do cache, contado como acerto; None se não está no cache (a falta é contada pelo
+    # fetch() que vier em seguida).
+    def cached(self, z, x, y):
+        data = self.get(z, x, y)
+        if data is not None:
+            with self._lock:
+                self.hits += 1
+        return data
+
+    # Tile do cache ou, na falta dele, baixado e gravado.
+    def fetch(self, z, x, y):
+        data = self.cached(z, x, y)
+        if data is not None:
+            return data
+        with self._lock:
+            self.misses += 1
+        data = self.download(z, x, y)
+        self.put(z, x, y, data)
+        return data
+
+    # Baixa os tiles da região que faltam no cache; devolve (baixados, falhas).
+    # `progress` (0–100) e `is_cancelled` seguem a convenção de workers.Worker(with_progress=True).
+    def prefetch(self, bounds, zooms, workers=TILE_PREFETCH_WORKERS, progress=None, is_cancelled=None,
+                 batch_size=64):
+        tiles = self.missing(tiles_in_bounds(bounds, zooms))
+        downloaded = failed = 0
+        batch = []
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = {}
+
+            def collect(done):
+                nonlocal downloaded, failed
+                for future in done:
+                    tile = pending.pop(future)
+                    try:
+                        batch.append((*tile, future.result()))
+                        downloaded += 1
+                    except TileError:
+                        failed += 1
+                if len(batch) >= batch_size:
+                    self.put_many(batch)
+                    batch.clear()
+                if progress is not None and tiles:
+                    progress(int(100 * (downloaded + failed) / len(tiles)))
+
+            for tile in tiles:
+                if is_cancelled is not None and is_cancelled():
+                    break
+                pending[executor.submit(self.download, *tile)] = tile
+                if len(pending) >= workers * 4:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+            if pending:
+                collect(wait(pending).done)
+        if batch:
+            self.put_many(batch)
+        return downloaded, failed
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM tiles').fetchone()[0]
+
+    def stats(self):
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        return {'hits': hits, 'misses': misses, 'tiles': len(self)}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
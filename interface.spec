@@ -8,7 +8,7 @@ a = Analysis(
     ['interface.py'],
     pathex=[],
     binaries=[],
-    datas=[],
+    datas=[('hammerpump/data', 'hammerpump/data')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
@@ -0,0 +1,98 @@
+# Ponte QWebChannel entre o mapa (Leaflet, no QtWebEngine) e a interface.
+# O JS do modelo do mapa (hammerpump.map_template.BRIDGE_JS) chama os slots abaixo com as
+# coordenadas já como números; eventos frequentes (movimento do mouse, arraste de marcadores)
+# são agrupados no próprio JS em no máximo um por quadro de animação.
+import json
+
+from PyQt5.QtCore import QFile, QIODevice, QObject, pyqtSignal, pyqtSlot
+from PyQt5.QtWebChannel import QWebChannel
+from PyQt5.QtWebEngineWidgets import QWebEngineScript
+
+# qwebchannel.js faz parte dos recursos do Qt.
+QWEBCHANNEL_JS = ':/qtwebchannel/qwebchannel.js'
+
+
+class MapBridge(QObject):
+    clicked = pyqtSignal(float, float)
+    hovered = pyqtSignal(float, float)
+    # Posição durante o arraste (prévia) e posição final de um marcador (nome, lat, lng).
+    marker_dragged = pyqtSignal(str, float, float)
+    marker_moved = pyqtSignal(str, float, float)
+    # Vértices internos dos traçados das tubulações (nome do traçado, índice do vértice, lat, lng).
+    route_vertex_dragged = pyqtSignal(str, int, float, float)
+    route_vertex_moved = pyqtSignal(str, int, float, float)
+    route_vertex_inserted = pyqtSignal(str, int, float, float)
+    route_vertex_removed = pyqtSignal(str, int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.page = None
+
+    # Publica a ponte como `bridge` na página e injeta qwebchannel.js antes dos scripts do mapa.
+    def install(self, page):
+        self.page = page
+        source = QFile(QWEBCHANNEL_JS)
+        source.open(QIODevice.ReadOnly)
+        script = QWebEngineScript()
+        script.setName('qwebchannel')
+        script.setSourceCode(bytes(source.readAll()).decode())
+        script.setInjectionPoint(QWebEngineScript.DocumentCreation)
+        script.setWorldId(QWebEngineScript.MainWorld)
+        page.scripts().insert(script)
+        channel = QWebChannel(page)
+        channel.registerObject('bridge', self)
+        page.setWebChannel(channel)
+
+    @pyqtSlot(float, float)
+    def click(self, lat, lng):
+        self.clicked.emit(lat, lng)
+
+    @pyqtSlot(float, float)
+    def hover(self, lat, lng):
+        self.hovered.emit(lat, lng)
+
+    @pyqtSlot(str, float, float)
+    def markerDragged(self, name, lat, lng):
+        self.marker_dragged.emit(name, lat, lng)
+
+    @pyqtSlot(str, float, float)
+    def markerMoved(self, name, lat, lng):
+        self.marker_moved.emit(name, lat, lng)
+
+    @pyqtSlot(str, int, float, float)
+    def routeVertexDragged(self, name, index, lat, lng):
+        self.route_vertex_dragged.emit(name, index, lat, lng)
+
+    @pyqtSlot(str, int, float, float)
+    def routeVertexMoved(self, name, index, lat, lng):
+        self.route_vertex_moved.emit(name, index, lat, lng)
+
+    @pyqtSlot(str, int, float, float)
+    def routeVertexInserted(self, name, index, lat, lng):
+        self.route_vertex_inserted.emit(name, index, lat, lng)
+
+    @pyqtSlot(str, int)
+    def routeVertexRemoved(self, name, index):
+        self.route_vertex_removed.emit(name, index)
+
+    # Mostra as posições sugeridas para a bomba: sequência de (lat, lng, rótulo).
+    def show_candidates(self, candidates):
+        if self.page is not None:
+            items = [{'lat': float(lat), 'lng': float(lng), 'label': label} for lat, lng, label in candidates]
+            self.page.runJavaScript(f"hammerpumpShowCandidates({json.dumps(items)});")
+
+    # Cria ou move o marcador arrastável `name` no mapa.
+    def set_marker(self, name, lat, lng):
+        if self.page is not None:
+            self.page.runJavaScript(f"hammerpumpSetMarker({json.dumps(name)}, {float(lat)!r}, {float(lng)!r});")
+
+    # Desenha (ou redesenha) o traçado `name`: sequência de (lat, lng), pontas incluídas.
+    def set_route(self, name, points):
+        if self.page is not None:
+            items = [[float(lat), float(lng)] for lat, lng in points]
+            self.page.runJavaScript(f"hammerpumpSetRoute({json.dumps(name)}, {json.dumps(items)});")
+
+    # Centraliza o mapa em (lat, lng), mantendo o zoom.
+    def set_view(self, lat, lng):
+        if self.page is not None:
+            self.page.runJavaScript(f"hammerpumpMap.setView([{float(lat)!r}, {float(lng)!r}]);")
@@ -0,0 +1,83 @@
+# Esquema de URL "hammertiles:" do QtWebEngine: o mapa pede os tiles como hammertiles:{z}/{y}/{x}
+# e eles são servidos pelo TileCache (MBTiles). Tiles já em cache são respondidos na hora,
+# na thread da interface; os ausentes são baixados em segundo plano (QThreadPool) e gravados.
+from PyQt5.QtCore import QBuffer, QByteArray, QIODevice, QThreadPool
+from PyQt5.QtWebEngineCore import QWebEngineUrlRequestJob, QWebEngineUrlScheme, QWebEngineUrlSchemeHandler
+
+from hammerpump.tile_cache import TileError, content_type
+from workers import Worker
+
+SCHEME = b'hammertiles'
+TILE_URL = SCHEME.decode() + ':{z}/{y}/{x}'
+
+
+# Precisa ser chamado antes de criar a QApplication.
+def register_scheme():
+    scheme = QWebEngineUrlScheme(SCHEME)
+    scheme.setSyntax(QWebEngineUrlScheme.Syntax.Path)
+    scheme.setFlags(QWebEngineUrlScheme.SecureScheme | QWebEngineUrlScheme.CorsEnabled)
+    QWebEngineUrlScheme.registerScheme(scheme)
+
+
+# Sem rede e fora do cache: o tile simplesmente não aparece.
+def fetch_or_none(cache, z, x, y):
+    try:
+        return cache.fetch(z, x, y)
+    except TileError:
+        return None
+
+
+class TileSchemeHandler(QWebEngineUrlSchemeHandler):
+    def __init__(self, cache, parent=None, max_threads=4):
+        super().__init__(parent)
+        self.cache = cache
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        # Downloads em andamento: id do job → (job, worker). Os workers ficam em _running até
+        # terminarem, mesmo quando o job é abandonado.
+        self._pending = {}
+        self._running = set()
+
+    # Instala o handler no perfil do QtWebEngine usado pela página do mapa.
+    def install(self, profile):
+        profile.installUrlSchemeHandler(SCHEME, self)
+
+    def requestStarted(self, job):
+        try:
+            z, y, x = (int(part) for part in job.requestUrl().path().strip('/').split('/'))
+        except ValueError:
+            job.fail(QWebEngineUrlRequestJob.UrlInvalid)
+            return
+        data = self.cache.cached(z, x, y)
+        if data is not None:
+            self.reply(job, data)
+            return
+        key = id(job)
+        worker = Worker(fetch_or_none, self.cache, z, x, y)
+        worker.signals.result.connect(lambda data: self.finish(key, data))
+        worker.signals.done.connect(lambda: self._running.discard(worker))
+        # O navegador pode desistir do tile (zoom ou arraste) antes do download terminar.
+        job.destroyed.connect(lambda: self.abandon(key))
+        self._pending[key] = (job, worker)
+        self._running.add(worker)
+        self.pool.start(worker)
+
+    def finish(self, key, data):
+        job, worker = self._pending.pop(key, (None, None))
+        if job is None:
+            return
+        if data is None:
+            job.fail(QWebEngineUrlRequestJob.RequestFailed)
+        else:
+            self.reply(job, data)
+
+    def abandon(self, key):
+        job, worker = self._pending.pop(key, (None, None))
+        if worker is not None:
+            worker.cancel()
+
+    def reply(self, job, data):
+        buffer = QBuffer(job)
+        buffer.setData(QByteArray(data))
+        buffer.open(QIODevice.ReadOnly)
+        job.reply(content_type(data).encode(), buffer)
@@ -0,0 +1,98 @@
+# Execução de tarefas de rede e de cálculo fora da thread da interface (QThreadPool).
+# Cada tarefa tem uma chave ("elevation", "flow", ...): enviar uma nova tarefa com a mesma
+# chave cancela a anterior, e resultados de tarefas canceladas são descartados.
+import traceback
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class WorkerSignals(QObject):
+    result = pyqtSignal(object)
+    error = pyqtSignal(str)
+    progress = pyqtSignal(int)
+    done = pyqtSignal()
+
+
+class Worker(QRunnable):
+    # Com with_progress=True a função recebe `progress` (callback 0–100) e `is_cancelled`.
+    def __init__(self, fn, *args, with_progress=False, **kwargs):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.cancelled = False
+        self.signals = WorkerSignals()
+        if with_progress:
+            self.kwargs['progress'] = self.signals.progress.emit
+            self.kwargs['is_cancelled'] = lambda: self.cancelled
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        try:
+            if self.cancelled:
+                return
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            traceback.print_exc()
+            if not self.cancelled:
+                self.signals.error.emit(str(e))
+        else:
+            if not self.cancelled:
+                self.signals.result.emit(result)
+        finally:
+            self.signals.done.emit()
+
+
+class TaskRunner(QObject):
+    # busy: há tarefas em andamento; progress: progresso (0–100) da última tarefa que informa.
+    busy = pyqtSignal(bool)
+    progress = pyqtSignal(int)
+
+    def __init__(self, parent=None, max_threads=4):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self._tasks = {}
+        self._running = set()
+
+    def submit(self, key, fn, *args, on_result=None, on_error=None, with_progress=False, **kwargs):
+        self.cancel(key)
+        worker = Worker(fn, *args, with_progress=with_progress, **kwargs)
+        if on_result is not None:
+            worker.signals.result.connect(on_result)
+        if on_error is not None:
+            worker.signals.error.connect(on_error)
+        worker.signals.progress.connect(self.progress)
+        worker.signals.done.connect(lambda: self._finished(key, worker))
+        self._tasks[key] = worker
+        self._running.add(worker)
+        self.busy.emit(True)
+        self.pool.start(worker)
+        return worker
+
+    # Cancela a tarefa da chave (ou todas, menos as de `keep`): se ainda não começou, sai da
+    # fila; se já está rodando, o resultado é descartado quando terminar.
+    def cancel(self, key=None, keep=()):
+        keys = [k for k in self._tasks if k not in keep] if key is None else [key]
+        for k in keys:
+            worker = self._tasks.pop(k, None)
+            if worker is None:
+                continue
+            worker.cancel()
+            if self.pool.tryTake(worker):
+                self._running.discard(worker)
+        if not self._running:
+            self.busy.emit(False)
+
+    def is_running(self, key):
+        return key in self._tasks
+
+    def _finished(self, key, worker):
+        if self._tasks.get(key) is worker:
+            del self._tasks[key]
+        self._running.discard(worker)
+        if not self._running:
+            self.busy.emit(False)